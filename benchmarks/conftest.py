@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from eyelink_track.eye_link import Eyelink, SimulatedEyeLink
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from psychopy.visual import Window
+
+    from eyelink_track.eye_link.EyeLinkCoreGraphicsPsychoPy import (
+        EyeLinkCoreGraphicsPsychoPy,
+    )
+
+
+@pytest.fixture
+def tracker() -> SimulatedEyeLink:
+    """Create a simulated tracker sampling at 1000 Hz."""
+    return SimulatedEyeLink(sampling_rate=1000, seed=101)
+
+
+@pytest.fixture
+def eye_link(tmp_path: Path, tracker: SimulatedEyeLink) -> Eyelink:
+    """Eyelink session on the simulated tracker, without graphics."""
+    eye_link = Eyelink(tmp_path, "BENCH", resolution=(1920, 1080), tracker=tracker)
+    yield eye_link
+    eye_link.close()
+
+
+@pytest.fixture(scope="session")
+def win() -> Window:
+    """Hidden PsychoPy window, the rendering happens in the back buffer."""
+    pytest.importorskip("psychopy.visual")
+    from psychopy import logging
+    from psychopy.visual import Window
+
+    logging.console.setLevel(logging.CRITICAL)
+    win = Window(
+        size=(800, 600),
+        units="pix",
+        fullscr=False,
+        winType="pyglet",
+        checkTiming=False,
+    )
+    win.winHandle.set_visible(False)
+    yield win
+    win.close()
+
+
+@pytest.fixture
+def genv(win: Window, tracker: SimulatedEyeLink) -> EyeLinkCoreGraphicsPsychoPy:
+    """Calibration graphics environment drawing in the hidden window."""
+    from eyelink_track.eye_link.EyeLinkCoreGraphicsPsychoPy import (
+        EyeLinkCoreGraphicsPsychoPy,
+    )
+
+    genv = EyeLinkCoreGraphicsPsychoPy(tracker, win)
+    genv.setCalibrationColors((-1, -1, -1), win.color)
+    genv.setTargetSize(24)
+    return genv
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from itertools import cycle
+
+import numpy as np
+import pytest
+
+from eyelink_track.eye_link._simulated import camera_frames, camera_palette
+
+pytest.importorskip("psychopy.visual")
+
+# calibration targets positions within the 800 x 600 benchmark window
+_TARGETS = [(x, y) for y in (60, 300, 540) for x in (80, 400, 720)]
+
+
+@pytest.mark.parametrize(("width", "height"), [(192, 160), (384, 320)])
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_draw_image_line(benchmark, genv, width, height, coalesce):
+    """Decode and render one camera frame pushed line by line."""
+    frames = camera_frames(width, height, 30, np.random.default_rng(101))
+    frames = cycle([[line.tobytes() for line in frame] for frame in frames])
+    genv.setCameraFrameCoalescing(coalesce)
+    genv.setup_image_display(width, height)
+    genv.__updateimgsize__(width, height)
+    genv.set_image_palette(*camera_palette())
+
+    def push_frame():
+        for k, line in enumerate(next(frames), start=1):
+            genv.draw_image_line(width, k, height, line)
+
+    benchmark(push_frame)
+    genv.exit_image_display()
+    benchmark.extra_info.update(genv.getCameraFrameStats())
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_set_image_palette(benchmark, genv, cached):
+    """Build the lookup table of a camera palette, cached or not."""
+    rng = np.random.default_rng(101)
+    # more palettes than the cache holds, such that every lookup misses
+    n_palettes = 1 if cached else 16
+    palettes = cycle(
+        [tuple(rng.integers(0, 256, size=(3, 256)).tolist()) for _ in range(n_palettes)]
+    )
+    benchmark(lambda: genv.set_image_palette(*next(palettes)))
+
+
+@pytest.mark.parametrize("target", ["circle", "picture"])
+def test_draw_cal_target(benchmark, genv, tmp_path, target):
+    """Draw then erase a calibration target, with one flip each."""
+    if target == "picture":
+        from PIL import Image
+
+        fname = tmp_path / "target.png"
+        Image.new("RGB", (64, 64), (255, 255, 255)).save(fname)
+        genv.setPictureTarget(fname)
+    genv.setTargetType(target)
+    genv.waitTargetAssets()
+    genv.setup_cal_display()
+    positions = cycle(_TARGETS)
+
+    def draw_target():
+        genv.draw_cal_target(*next(positions))
+        genv.erase_cal_target()
+
+    benchmark(draw_target)
+    genv.exit_cal_display()
+    benchmark.extra_info.update(genv.getFlipStats())
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from eyelink_track.eye_link._bench import drain_link, fill_link
+
+
+def test_signal(benchmark, eye_link):
+    """Send a message synchronously."""
+    benchmark(eye_link.signal, "TRIGGER")
+
+
+def test_signal_queued(benchmark, eye_link):
+    """Queue messages 1 ms apart, the latency until they are sent is in extra_info."""
+    benchmark.pedantic(
+        eye_link.signal,
+        args=("TRIGGER",),
+        kwargs=dict(queued=True),
+        setup=lambda: time.sleep(0.001),
+        rounds=500,
+    )
+    while eye_link.signal_stats()["queue_depth"] != 0:
+        time.sleep(0.01)
+    stats = eye_link.signal_stats()
+    for stage in ("send", "latency"):
+        for key, value in stats[stage].items():
+            benchmark.extra_info[f"{stage}_{key}"] = value
+
+
+@pytest.mark.parametrize("duration", [0.25, 1.0])
+def test_sample_drain(benchmark, duration):
+    """Drain the samples and events buffered by the link at 2000 Hz."""
+    counts = []  # samples buffered in each round
+
+    def setup():
+        tracker = fill_link(duration)
+        counts.append(tracker.n_buffered_samples())
+        return (tracker, counts[-1]), dict()
+
+    benchmark.pedantic(drain_link, setup=setup, rounds=5, iterations=1)
+    n_samples = sum(counts) / len(counts)
+    benchmark.extra_info["n_samples"] = n_samples
+    if benchmark.stats is not None:  # None with --benchmark-disable
+        benchmark.extra_info["samples_per_second"] = n_samples / benchmark.stats["mean"]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from eyelink_track.eye_link import Eyelink
+
+
+def test_eyelink(benchmark, tmp_path, tracker):
+    """Create a session on the simulated tracker, the graphics are lazy."""
+    benchmark(Eyelink, tmp_path, "BENCH", resolution=(1920, 1080), tracker=tracker)
+
+
+@pytest.mark.parametrize(
+    "module", ["eyelink_track", "eyelink_track.commands.main", "eyelink_track.eye_link"]
+)
+def test_import_time(benchmark, module):
+    """Import a module in a new interpreter, including the interpreter start-up."""
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", f"import {module}"],),
+        kwargs=dict(check=True),
+        rounds=5,
+        iterations=1,
+    )
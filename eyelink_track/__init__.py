@@ -1,4 +1,15 @@
+from typing import TYPE_CHECKING
+
 from . import config, utils
-from ._version import __version__
-from .utils.config import sys_info
+from .utils._imports import lazy_attributes
 from .utils.logs import add_file_handler, logger, set_log_level
+
+# the version and sys_info() load importlib.metadata, psutil and packaging
+__getattr__, __dir__, _ = lazy_attributes(
+    __name__,
+    attributes={"__version__": "._version", "sys_info": ".utils.config"},
+)
+
+if TYPE_CHECKING:
+    from ._version import __version__
+    from .utils.config import sys_info
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from pyglet.canvas import Display
-from qtpy.QtCore import QRegularExpression, Slot
+from qtpy.QtCore import QRegularExpression, Signal, Slot
 from qtpy.QtGui import QRegularExpressionValidator
 from qtpy.QtWidgets import (
     QAction,
@@ -21,8 +22,12 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
-from .eye_link import Eyelink
+from .eye_link import Eyelink, SimulatedEyeLink
 from .utils._checks import check_type
+from .utils.logs import logger
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
 
 
 class GUI(QMainWindow):
@@ -31,13 +36,19 @@ class GUI(QMainWindow):
     Parameters
     ----------
     mock : bool
-        If True, uses a mock eye-tracker.
+        If True, uses a simulated eye-tracker.
     """
 
+    # emitted from the EDF download thread, delivered in the GUI thread
+    _transfer_progress = Signal(int, int, float)
+    _transfer_done = Signal(object)
+
     def __init__(self, mock: bool) -> None:
         check_type(mock, (bool,), "mock")
         self._mock = mock
         super().__init__()
+        self._transfer_progress.connect(self._on_transfer_progress)
+        self._transfer_done.connect(self._on_transfer_done)
         self.setCentralWidget(CentralWidget())
         # tool bar
         start = QAction(
@@ -83,30 +94,49 @@ class GUI(QMainWindow):
         screen = self.centralWidget().findChildren(QComboBoxScreen)[0].screen
         resolution = self.centralWidget().findChildren(QComboBoxScreen)[0].resolution
         # start eye-tracker
-        kwargs = dict(host_ip=None) if self._mock else dict()
+        kwargs = dict(tracker=SimulatedEyeLink()) if self._mock else dict()
         self.eye_link = Eyelink(
             pname=directory, fname=fname, screen=screen, resolution=resolution, **kwargs
         )
         if not self._mock:
             self.statusBar().showMessage("[Calibrating..]")
             self.eye_link.calibrate()
-        self.eye_link.win.close()
+            self.eye_link.win.close()
         self.statusBar().showMessage("[Recording..]")
         self.eye_link.start()
 
     @Slot()
     def stop(self) -> None:
         """Stop the EyeTracker calibration and recording."""
-        # stop eye-tracker
+        self.findChildren(QAction, name="stop")[0].setEnabled(False)
+        # stop eye-tracker, the EDF file is downloaded in the background
         self.statusBar().showMessage("[Stopping and transferring file..]")
-        self.eye_link.stop()
+        future = self.eye_link.stop(wait=False, progress=self._transfer_progress.emit)
+        future.add_done_callback(self._transfer_done.emit)
+
+    @Slot(int, int, float)
+    def _on_transfer_progress(self, received: int, size: int, percent: float) -> None:
+        """Display the progress of the EDF file transfer."""
+        self.statusBar().showMessage(
+            f"[Transferring file.. {received / 1e6:.1f} / {size / 1e6:.1f} MB "
+            f"({percent:.0f}%)]"
+        )
+
+    @Slot(object)
+    def _on_transfer_done(self, future: Future) -> None:
+        """Re-enable the settings once the EDF file is transferred."""
+        if future.exception() is not None:
+            logger.error("The EDF file transfer failed: %s", future.exception())
         self.findChildren(QAction, name="start")[0].setEnabled(True)
-        self.findChildren(QAction, name="stop")[0].setEnabled(False)
         # enable widgets from the central widget
         for widget_type in (QLineEdit, QPushButton, QComboBoxScreen):
             for widget in self.centralWidget().findChildren(widget_type):
                 widget.setEnabled(True)
-        self.statusBar().showMessage("[Not recording]")
+        self.statusBar().showMessage(
+            "[Not recording]"
+            if future.exception() is None
+            else "[Not recording - file transfer failed]"
+        )
 
 
 class CentralWidget(QWidget):
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+
+import click
+
+# title of the benchmarks, in the order they are displayed
+_TITLES = {
+    "flip": "Window flip",
+    "camera": "Camera preview",
+    "message": "Messages",
+    "drain": "Sample drain",
+}
+
+
+@click.command(name="bench")
+@click.option("--screen", help="ID of the screen to use.", type=int, default=0)
+@click.option(
+    "--graphics/--no-graphics",
+    help="Measure the window flips and the camera preview, which opens a window.",
+    default=True,
+)
+@click.option("--json", "as_json", help="Print the results as JSON.", is_flag=True)
+def run(screen: int, graphics: bool, as_json: bool) -> None:
+    """Run bench() command."""
+    from ..eye_link._bench import run_benchmarks
+
+    results = run_benchmarks(screen=screen, graphics=graphics)
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+    for name, title in _TITLES.items():
+        if name not in results:
+            continue
+        click.echo(title)
+        for metric, value in results[name].items():
+            value = f"{value:.3f}" if isinstance(value, float) else str(value)
+            click.echo(f"  {metric:<20}{value:>12}")
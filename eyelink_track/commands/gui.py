@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 import click
-from qtpy.QtWidgets import QApplication
 
 
 @click.command(name="gui")
 @click.option(
     "--mock",
-    help="Use a mock eye-tracker.",
+    help="Use a simulated eye-tracker.",
     is_flag=True,
 )
 def run(mock: bool) -> None:
     """Run the eyelink-track GUI."""
+    from qtpy.QtWidgets import QApplication
+
     from .._gui import GUI
 
     app = QApplication([])
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import click
 
+from .bench import run as bench
 from .gui import run as gui
 from .sys_info import run as sys_info
 from .track import run as track
@@ -12,6 +13,7 @@ def run() -> None:
     """Main package entry-point."""  # noqa: D401
 
 
+run.add_command(bench)
 run.add_command(gui)
 run.add_command(sys_info)
 run.add_command(track)
@@ -0,0 +1,24 @@
+import json
+
+from click.testing import CliRunner
+
+from ..bench import run
+
+
+def test_bench():
+    """Test the benchmark entry-point, without graphics."""
+    runner = CliRunner()
+    result = runner.invoke(run, ["--no-graphics"])
+    assert result.exit_code == 0
+    assert "Messages" in result.output
+    assert "Sample drain" in result.output
+    assert "Window flip" not in result.output
+    assert "samples_per_second" in result.output
+
+    result = runner.invoke(run, ["--no-graphics", "--json"])
+    assert result.exit_code == 0
+    results = json.loads(result.output)
+    assert set(results) == {"message", "drain"}
+    assert results["message"]["rtt_p50_ms"] <= results["message"]["rtt_max_ms"]
+    assert 1000 < results["drain"]["n_samples"]
+    assert 0 < results["drain"]["samples_per_second"]
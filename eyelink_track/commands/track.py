@@ -13,13 +13,28 @@ import click
     default=Path.cwd() / datetime.now().strftime("%H%M%S"),
 )
 @click.option("--screen", help="ID of the screen to use.", type=int, default=0)
-def run(fname: Path, screen: int) -> None:
+@click.option(
+    "--calibrate/--no-calibrate",
+    help="Calibrate before recording. Without calibration, no window is created.",
+    default=True,
+)
+def run(fname: Path, screen: int, calibrate: bool) -> None:
     """Run track() command."""
     from ..eye_link import Eyelink
 
     eye_link = Eyelink(pname=fname.parent, fname=fname.name, screen=screen)
-    eye_link.calibrate()
-    eye_link.win.close()
+    if calibrate:
+        eye_link.calibrate()
+        eye_link.win.close()
     eye_link.start()
     input(">>> Press ENTER to stop the recording.")
-    eye_link.stop()
+    eye_link.stop(progress=_echo_progress)
+    click.echo()
+
+
+def _echo_progress(received: int, size: int, percent: float) -> None:
+    """Display the progress of the EDF file transfer."""
+    click.echo(
+        f"\rTransferring {received / 1e6:.1f} / {size / 1e6:.1f} MB ({percent:.0f}%)",
+        nl=False,
+    )
@@ -1,23 +1,37 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from typing import TYPE_CHECKING
 
 import pylink
-from psychopy import logging
-from psychopy.event import waitKeys
-from psychopy.visual import TextStim, Window
 
 from ..config import FOREGROUND_COLOR, HOST_IP, SCREEN_KWARGS
 from ..utils._checks import check_type, ensure_int, ensure_path
+from ..utils._transfer import download_file
 from ..utils.logs import logger
-from .EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+from ._rotate import BlockRotation
+from ._signal import SignalSender
+from ._stream import LinkReader
+from ._sync import ClockSync
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
     from pathlib import Path
 
-# set psychopy log level
-logging.console.setLevel(logging.CRITICAL)
+    from psychopy.visual import Window
+
+    from ..utils._buffer import RingBuffer
+    from ..utils._clock import ClockModel
+    from ..utils._transfer import TransferReport
+    from ._simulated import SimulatedEyeLink
+    from ._stream import LinkEvent
+    from .EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+
+# time left to the Host PC to finish writing the EDF file before closing it
+_EDF_SETTLE_MS: int = 500
 
 
 class Eyelink:
@@ -37,7 +51,16 @@ class Eyelink:
     screen : int | None
         IDx of the screen to use.
     resolution : tuple | None
-        Resolution of the screen to set.
+        Resolution of the screen to set. If None, the size of the screen ``screen``
+        is used, read with pyglet.
+    tracker : EyeLink | None
+        Connection to use instead of connecting to ``host_ip``, e.g. a
+        :class:`~eyelink_track.eye_link.SimulatedEyeLink`.
+
+    Notes
+    -----
+    The PsychoPy window and the graphics environment are only created on first
+    use, e.g. by :meth:`calibrate`. A recording-only session does not load OpenGL.
     """
 
     def __init__(
@@ -47,16 +70,9 @@ class Eyelink:
         host_ip: str | None = HOST_IP,
         screen: int | None = None,
         resolution: tuple[int, int] | None = None,
+        tracker: pylink.EyeLink | SimulatedEyeLink | None = None,
     ) -> None:
-        pname = ensure_path(pname, must_exist=False)
-        if not pname.exists():
-            os.makedirs(pname)
-        self.edf_pname = pname
-        check_type(fname, (str,), "fname")
-        if fname.endswith(".EDF"):
-            fname = fname.split(".EDF")[0]
-        if 8 < len(fname):
-            raise ValueError("The fname should not exceed 8 alphanumeric characters.")
+        pname, fname = _check_edf_fname(pname, fname)
         if screen is not None:
             screen = ensure_int(screen, "screen")
             if screen < 0:
@@ -66,12 +82,26 @@ class Eyelink:
             if len(resolution) != 2:
                 raise ValueError("The resolution should be a tuple of 2 integers.")
             resolution = tuple(ensure_int(res, "resolution") for res in resolution)
+        self.edf_pname = pname
         self.edf_fname = fname
+        # serialize the calls to the tracker connection shared with the link reader
+        self._tracker_lock = Lock()
+        self._reader = None
+        self._event_callbacks = []
+        self._sender = None
+        self._sync = None
+        self._transfer = None
+        self._transfer_executor = None
+        self._rotation = None
+        self._blocks = []
+        self._finished = []
+        self._win = None
+        self._genv = None
 
         # ----------------------------------------------------------------------
         # Step 1: Connect to the EyeLink Host PC
         try:
-            self.el_tracker = pylink.EyeLink(host_ip)
+            self.el_tracker = pylink.EyeLink(host_ip) if tracker is None else tracker
         except RuntimeError:
             self.close()
             raise
@@ -93,7 +123,7 @@ class Eyelink:
         # 1-EyeLink I, 2-EyeLink II, 3/4-EyeLink 1000, 5-EyeLink 1000 Plus,
         # 6-Portable DUO
         eyelink_ver = 0  # set version to 0, in case running in Dummy mode
-        if host_ip is not None:
+        if host_ip is not None or tracker is not None:
             vstr = self.el_tracker.getTrackerVersionString()
             eyelink_ver = int(vstr.split()[-1].split(".")[0])
             logger.debug("Running experiment on %s, version %d", vstr, eyelink_ver)
@@ -129,14 +159,22 @@ class Eyelink:
         self.el_tracker.sendCommand("calibration_type = HV9")
         self.el_tracker.sendCommand("button_function 5 'accept_target_fixation'")
 
-        # Step 4: set up a graphics environment for calibration
-        SCREEN_KWARGS["screen"] = 0 if screen is None else screen
-        SCREEN_KWARGS["size"] = resolution if resolution is not None else (1920, 1080)
-        self.win = Window(units="pix", **SCREEN_KWARGS)
-
-        # get the native screen resolution used by PsychoPy
-        self.scn_width, self.scn_height = self.win.size
+        # Step 4: pass the display pixel coordinates to the tracker, the window and
+        # the graphics environment for calibration are created on first use
+        screen_kwargs = dict(SCREEN_KWARGS)
+        screen_kwargs["screen"] = 0 if screen is None else screen
+        # the gaze coordinates of a recording without window are in this space
+        screen_kwargs["size"] = (
+            resolution
+            if resolution is not None
+            else _screen_size(screen_kwargs["screen"])
+        )
+        self._screen_kwargs = screen_kwargs
+        self._set_screen_pixel_coords(*screen_kwargs["size"])
 
+    def _set_screen_pixel_coords(self, width: int, height: int) -> None:
+        """Pass the display pixel coordinates to the tracker."""
+        self.scn_width, self.scn_height = width, height
         # Pass the display pixel coordinates (left, top, right, bottom) to the
         # tracker, c.f EyeLink Installation Guide "Customizing Screen Settings"
         el_coords = (
@@ -144,18 +182,88 @@ class Eyelink:
         )
         self.el_tracker.sendCommand(el_coords)
 
+    def _setup_graphics(self) -> None:
+        """Create the window and the graphics environment for calibration."""
+        # imported here to not load OpenGL for recording-only sessions
+        from psychopy import logging
+        from psychopy.visual import Window
+
+        from .EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+
+        # set psychopy log level
+        logging.console.setLevel(logging.CRITICAL)
+        self._win = Window(units="pix", **self._screen_kwargs)
+
+        # get the native screen resolution used by PsychoPy
+        if tuple(self._win.size) != (self.scn_width, self.scn_height):
+            self._set_screen_pixel_coords(*self._win.size)
+
         # Configure a graphics environment (genv) for tracker calibration
-        self.genv = EyeLinkCoreGraphicsPsychoPy(self.el_tracker, self.win)
-        logger.debug(self.genv)  # version number of the CoreGraphics library
+        self._genv = EyeLinkCoreGraphicsPsychoPy(self.el_tracker, self._win)
+        logger.debug(self._genv)  # version number of the CoreGraphics library
 
         # Set background and foreground colors for the calibration target
         # in PsychoPy, (-1, -1, -1)=black, (1, 1, 1)=white, (0, 0, 0)=mid-gray
         foreground_color = FOREGROUND_COLOR
-        background_color = self.win.color
-        self.genv.setCalibrationColors(foreground_color, background_color)
-        self.genv.setTargetType("circle")
-        self.genv.setTargetSize(24)
-        pylink.openGraphicsEx(self.genv)
+        background_color = self._win.color
+        self._genv.setCalibrationColors(foreground_color, background_color)
+        self._genv.setTargetType("circle")
+        self._genv.setTargetSize(24)
+        # keep the camera preview live on slow PCs by dropping stale frames
+        self._genv.setCameraFrameCoalescing(True)
+        # a simulated tracker drives the graphics environment itself
+        open_graphics = getattr(
+            self.el_tracker, "openGraphicsEx", pylink.openGraphicsEx
+        )
+        open_graphics(self._genv)
+
+    @property
+    def win(self) -> Window:
+        """PsychoPy window used for calibration, created on first access."""
+        if self._win is None:
+            self._setup_graphics()
+        return self._win
+
+    @property
+    def genv(self) -> EyeLinkCoreGraphicsPsychoPy:
+        """Graphics environment used for calibration, created on first access."""
+        if self._genv is None:
+            self._setup_graphics()
+        return self._genv
+
+    def open_file(self, fname: str, pname: str | Path | None = None) -> None:
+        """Open a new EDF file on the Host PC for the next recording.
+
+        The connection, the configuration and the graphics environment are
+        re-used, which makes recording several EDF files in a row fast. The
+        previous EDF file must be closed with ``stop(close=False)``.
+
+        Parameters
+        ----------
+        fname : str
+            Name of the .EDF file saved. The file name should not exceed 8
+            alphanumerical characters (number 0-9, letters and '_' (underscores),
+            and should not include the extension '.EDF'.
+        pname : path-like | None
+            Path to the directory where the .EDF file is saved locally. If None, the
+            directory of the previous EDF file is used.
+        """
+        pname, fname = _check_edf_fname(
+            self.edf_pname if pname is None else pname, fname
+        )
+        if self._transfer is not None:
+            # the Host PC handles one file transfer at a time
+            transfer, self._transfer = self._transfer, None
+            try:
+                transfer.result()
+            except Exception as error:
+                # already raised by stop() or by its future
+                logger.warning(
+                    "The download of the previous EDF file failed: %s", error
+                )
+        self.el_tracker.openDataFile(fname + ".EDF")
+        self.edf_pname = pname
+        self.edf_fname = fname
 
     def clear_screen(self):
         """Clear up the PsychoPy window."""
@@ -164,6 +272,9 @@ class Eyelink:
 
     def show_msg(self, text, wait_for_keypress=True):
         """Show task instructions on screen."""
+        from psychopy.event import waitKeys
+        from psychopy.visual import TextStim
+
         msg = TextStim(
             self.win,
             text,
@@ -185,52 +296,450 @@ class Eyelink:
         task_msg = "\nPress ENTER twice to display tracker menu."
         self.win.winHandle.activate()
         self.show_msg(task_msg)
+        # the picture target is decoded while the instructions show, the target
+        # stimuli are then created before entering the calibration
+        self.genv.waitTargetAssets()
         try:
             self.el_tracker.doTrackerSetup()
         except RuntimeError:
             self.el_tracker.exitCalibration()
             self.close()
             raise
+        # give the key presses back to psychopy.event
+        self.genv.releaseKeyboard()
+
+    def start(
+        self,
+        stream: bool = False,
+        capacity: int = 60000,
+        clock_sync: bool = False,
+        block_duration: float | None = None,
+    ):
+        """Start recording.
 
-    def start(self):
-        """Start recording."""
+        Parameters
+        ----------
+        stream : bool
+            If True, the data sent over the link is read in a background thread.
+            The samples are stored in a ring buffer, available in :attr:`samples`,
+            and the fixation, saccade and blink events are available with
+            :meth:`get_events` and forwarded to the event callbacks.
+        capacity : int
+            Number of samples kept in the ring buffer, 30 seconds at 2000 Hz by
+            default.
+        clock_sync : bool
+            If True, the tracker clock is sampled against the local
+            :func:`time.perf_counter` clock every second during the recording. The
+            offset and drift model is available in :attr:`clock` and saved next to
+            the EDF file as ``<fname>_clock.json`` by :meth:`stop`.
+        block_duration : float | None
+            If set, the recording is split in blocks of ``block_duration`` seconds.
+            At the end of a block, the EDF file is closed and the next one is
+            opened, ``<fname>001.EDF``, ``<fname>002.EDF``, ... The finished
+            blocks are downloaded by :meth:`stop`, once the tracker is offline,
+            before the last one. The ``fname`` must then not exceed 5 characters.
+            The recording is paused for about 500 ms between blocks, for the Host
+            PC to finish writing the EDF file. If a rotation fails, the recording
+            stops and :meth:`stop` raises.
+        """
+        check_type(stream, (bool,), "stream")
+        capacity = ensure_int(capacity, "capacity")
+        check_type(clock_sync, (bool,), "clock_sync")
+        if block_duration is not None:
+            check_type(block_duration, ("numeric",), "block_duration")
+            if block_duration <= 0:
+                raise ValueError(
+                    "The block duration must be strictly positive. Got "
+                    f"{block_duration}."
+                )
+            if 5 < len(self.edf_fname):
+                raise ValueError(
+                    "The fname should not exceed 5 alphanumeric characters to leave "
+                    "room for the block number."
+                )
+        self._reader = None
+        self._sender = None
+        self._sync = None
+        self._blocks = []
+        self._finished = []
+        self._recording_fname = self.edf_fname
         self.el_tracker.startRecording(1, 1, 1, 1)
         self.el_tracker.sendMessage("START")
+        if stream:
+            self._reader = LinkReader(
+                self.el_tracker, self._tracker_lock, capacity, self._event_callbacks
+            )
+            self._reader.start()
+        if clock_sync:
+            self._sync = ClockSync(self.el_tracker, self._tracker_lock)
+            self._sync.start()
+        if block_duration is not None:
+            self._rotation = BlockRotation(block_duration, self._rotate_edf)
+            self._rotation.start()
 
-    def stop(self):
-        """Stop recording."""
-        self.el_tracker.stopRecording()
-        self.el_tracker.setOfflineMode()
+    def _rotate_edf(self) -> None:
+        """Close the current EDF file and open the next one."""
+        fname = f"{self._recording_fname}{len(self._finished) + 1:03d}"
+        with self._tracker_lock:
+            if self._rotation.stopped:
+                # stop() is waiting for the lock to end the recording
+                return
+            self.el_tracker.stopRecording()
+            self.el_tracker.setOfflineMode()
+            pylink.msecDelay(_EDF_SETTLE_MS)
+            self.el_tracker.closeDataFile()
+            self.el_tracker.openDataFile(fname + ".EDF")
+            self.el_tracker.startRecording(1, 1, 1, 1)
+            self.el_tracker.sendMessage("START")
+        previous, self.edf_fname = self.edf_fname, fname
+        logger.info("EDF file '%s' closed, recording to '%s'.", previous, fname)
+        # the Host PC can not send a file while recording, the finished blocks
+        # are downloaded by stop()
+        self._finished.append(previous)
+
+    def _receive_data_file(self, src: str, dest: str) -> int:
+        """Download a file from the Host PC, holding the tracker connection."""
+        # the link is not read and the messages wait during the transfer
+        with self._tracker_lock:
+            return self.el_tracker.receiveDataFile(src, dest)
+
+    def _get_transfer_executor(self) -> ThreadPoolExecutor:
+        """Executor running the EDF transfers one at a time, in order."""
+        if self._transfer_executor is None:
+            self._transfer_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="eyelink-edf"
+            )
+        return self._transfer_executor
+
+    @property
+    def blocks(self) -> list[Future]:
+        """Transfers of the finished blocks of the recording.
+
+        Each :class:`~concurrent.futures.Future` resolves to the
+        :class:`TransferReport` of a block closed with ``block_duration``, in
+        order. The transfers are queued by :meth:`stop` once the tracker is
+        offline, the list is empty during the recording.
+        """
+        return list(self._blocks)
+
+    @property
+    def clock(self) -> ClockModel:
+        """Offset and drift model between the local and the tracker clocks.
+
+        Use :meth:`~ClockModel.local_to_tracker` and
+        :meth:`~ClockModel.tracker_to_local` to convert arrays of timestamps between
+        the local :func:`time.perf_counter` clock, in seconds, and the tracker
+        clock of the EDF file, in milliseconds.
+        """
+        if self._sync is None:
+            raise RuntimeError(
+                "The clock model is only available after start(clock_sync=True)."
+            )
+        return self._sync.fit()
+
+    @property
+    def samples(self) -> RingBuffer:
+        """Ring buffer of the samples streamed during the recording.
+
+        The fields of a sample are defined in ``SAMPLE_DTYPE``. Use
+        :meth:`~RingBuffer.last` for a view of the last samples and
+        :meth:`~RingBuffer.iter_chunks` to iterate over the new samples.
+        """
+        if self._reader is None:
+            raise RuntimeError(
+                "The samples are only available after start(stream=True)."
+            )
+        return self._reader.samples
+
+    def get_events(self) -> list[LinkEvent]:
+        """Pull the link events received since the previous call.
 
-        # Clear the Host PC screen and wait for 500 ms
-        self.el_tracker.sendCommand("clear_screen 0")
-        pylink.msecDelay(500)
+        Returns
+        -------
+        events : list of LinkEvent
+            The fixation, saccade and blink events, oldest to newest.
+        """
+        if self._reader is None:
+            raise RuntimeError(
+                "The events are only available after start(stream=True)."
+            )
+        return self._reader.get_events()
+
+    def add_event_callback(self, callback: Callable[[LinkEvent], None]) -> None:
+        """Add a function called with each link event.
+
+        Parameters
+        ----------
+        callback : callable
+            Function called with each :class:`LinkEvent` received during a
+            recording started with ``stream=True``. It is called from the thread
+            reading the link and should return quickly.
+        """
+        check_type(callback, ("callable",), "callback")
+        self._event_callbacks.append(callback)
+
+    def remove_event_callback(self, callback: Callable[[LinkEvent], None]) -> None:
+        """Remove a function added with :meth:`add_event_callback`.
+
+        Parameters
+        ----------
+        callback : callable
+            The function to remove.
+        """
+        self._event_callbacks.remove(callback)
+
+    def stop(
+        self,
+        wait: bool = True,
+        progress: Callable[[int, int, float], None] | None = None,
+        close: bool = True,
+    ) -> TransferReport | Future:
+        """Stop recording and download the EDF file.
+
+        The EDF file is downloaded to a temporary file, verified against the size
+        reported by the Host PC and renamed into ``pname``. A failed download is
+        retried up to 3 times with an exponential backoff.
+
+        Parameters
+        ----------
+        wait : bool
+            If True, blocks until the EDF file is downloaded and, with
+            ``close=True``, the connection to the tracker is closed. If False, the
+            download runs in a background thread and a future is returned
+            immediately.
+        progress : callable | None
+            Function called during the download with the number of bytes received,
+            the size of the EDF file in bytes and the percentage received.
+        close : bool
+            If True, the window is closed before the download and the connection to
+            the tracker once the EDF file is downloaded. If False, they are kept
+            open to record the next EDF file opened with :meth:`open_file`.
+
+        Returns
+        -------
+        report : TransferReport | Future
+            The report of the download, with the path to the local EDF file, its
+            size, the duration and the throughput of the transfer. If
+            ``wait=False``, a :class:`~concurrent.futures.Future` resolving to the
+            report once the EDF file is downloaded and the connection closed.
+        """
+        check_type(wait, (bool,), "wait")
+        check_type(progress, ("callable", None), "progress")
+        check_type(close, (bool,), "close")
+        rotation_error = None
+        if self._rotation is not None:
+            # an ongoing rotation is short, wait for it to leave a consistent file
+            self._rotation.stop(timeout=None)
+            rotation_error = self._rotation.error
+            self._rotation = None
+        if self._sender is not None:
+            # the queued signals are sent before the recording stops
+            self._sender.stop()
+        if self._reader is not None:
+            self._reader.stop()
+        if self._sync is not None:
+            self._save_clock()
+        with self._tracker_lock:
+            self.el_tracker.stopRecording()
+            self.el_tracker.setOfflineMode()
+            # Clear the Host PC screen
+            self.el_tracker.sendCommand("clear_screen 0")
+        if close:
+            # the window must be closed from the thread which created it, the
+            # download thread only closes the connection
+            self._close_graphics()
+        self._blocks = [
+            self._get_transfer_executor().submit(
+                download_file,
+                self._receive_data_file,
+                fname + ".EDF",
+                self.edf_pname / (fname + ".EDF"),
+            )
+            for fname in self._finished
+        ]
+        self._finished = []
+        # queued after the transfers of the previous blocks
+        self._transfer = self._get_transfer_executor().submit(
+            self._download_edf, self.edf_pname, self.edf_fname, progress, close
+        )
+        if rotation_error is not None:
+            if wait:
+                self._transfer.result()
+            raise RuntimeError(
+                f"The rotation of the EDF file '{self.edf_fname}' failed and the "
+                "recording stopped. The EDF file is still downloaded."
+            ) from rotation_error
+        if wait:
+            return self._transfer.result()
+        return self._transfer
 
-        # Close the edf data file on the Host
-        self.el_tracker.closeDataFile()
-        # Download the EDF data file from the Host PC to a local data folder
-        # parameters: source_file_on_the_host, destination_file_on_local_drive
-        local_edf = str(self.edf_pname / (self.edf_fname + ".EDF"))
+    def _download_edf(
+        self,
+        pname: Path,
+        fname: str,
+        progress: Callable[[int, int, float], None] | None,
+        close: bool,
+    ) -> TransferReport:
+        """Close and download the EDF file, then close the connection if requested."""
         try:
-            self.el_tracker.receiveDataFile(self.edf_fname + ".EDF", local_edf)
-        except RuntimeError:
-            raise
+            # leave 500 ms to the Host PC to finish writing the EDF file
+            pylink.msecDelay(_EDF_SETTLE_MS)
+            # Close the edf data file on the Host
+            with self._tracker_lock:
+                self.el_tracker.closeDataFile()
+            # called by pylink during receiveDataFile()
+            self.el_tracker.progressUpdate = lambda src, size, received: (
+                _report_progress(progress, size, received)
+            )
+            # Download the EDF data file from the Host PC to a local data folder
+            report = download_file(
+                self._receive_data_file,
+                fname + ".EDF",
+                pname / (fname + ".EDF"),
+            )
         finally:
-            self.close()
+            if close:
+                # the executor can not wait for its own thread
+                executor, self._transfer_executor = self._transfer_executor, None
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                self._disconnect()
+        return report
 
-    def signal(self, value: str):
-        """Send a trigger signal."""
-        self.el_tracker.sendMessage(value)
-
-    def close(self):
-        """Close in case a RuntimeError was raised."""
+    def _save_clock(self) -> None:
+        """Stop the clock sampling and save the model next to the EDF file."""
+        self._sync.stop()
+        fname = self.edf_pname / f"{self._recording_fname}_clock.json"
         try:
-            self.el_tracker.close()
-        except Exception:
-            pass
+            model = self._sync.fit()
+        except ValueError as error:
+            logger.warning("The clock model could not be fitted: %s", error)
+            return
+        model.save(fname, **self._sync.samples())
+        logger.info("Clock model %s saved to '%s'.", model, fname)
+
+    def signal(self, value: str, queued: bool = False):
+        """Send a trigger signal.
+
+        Parameters
+        ----------
+        value : str
+            The message to send.
+        queued : bool
+            If True, the message is timestamped with the local high-resolution clock
+            and sent by a background thread with an offset, such that the EDF
+            timestamp reflects the moment of the call. The call returns without
+            waiting for the link.
+        """
+        if not queued:
+            with self._tracker_lock:
+                self.el_tracker.sendMessage(value)
+            return
+        if self._sender is None or not self._sender.is_alive():
+            self._sender = SignalSender(self.el_tracker, self._tracker_lock)
+            self._sender.start()
+        self._sender.put(value)
+
+    def signal_stats(self) -> dict:
+        """Metrics of the queued signals.
+
+        Returns
+        -------
+        stats : dict
+            Dictionary with the number of signals waiting to be sent
+            ``queue_depth``, the number of signals which could not be sent
+            ``failed`` and, once signals are sent, the summary of the duration
+            of ``sendMessage`` as ``send`` and of the time between the call to
+            :meth:`signal` and the end of ``sendMessage`` as ``latency``. The
+            summaries contain the number of signals ``n`` and the percentiles
+            ``p50``, ``p95``, ``p99`` and the maximum ``max``, in milliseconds.
+        """
+        if self._sender is None:
+            return dict(queue_depth=0, failed=0)
+        return self._sender.stats()
+
+    def close(self, close_window: bool = True):
+        """Close in case a RuntimeError was raised.
+
+        The ongoing and queued downloads of EDF files are completed before the
+        connection to the tracker is closed.
+
+        Parameters
+        ----------
+        close_window : bool
+            If True, the window and the graphics environment are also closed, which
+            must happen on the thread which created the window.
+        """
+        executor, self._transfer_executor = self._transfer_executor, None
+        if executor is not None:
+            # the ongoing and queued transfers are not interrupted
+            executor.shutdown(wait=True)
+        self._disconnect()
+        if close_window:
+            self._close_graphics()
+
+    def _disconnect(self):
+        """Send the queued signals and close the connection to the tracker."""
+        if self._sender is not None and self._sender.is_alive():
+            # the queued signals are sent before the connection closes
+            self._sender.stop()
+        with self._tracker_lock:
+            try:
+                self.el_tracker.close()
+            except Exception:
+                pass
+
+    def _close_graphics(self):
+        """Close the window and the graphics environment, if they were created."""
+        if self._genv is not None:
+            self._close_window()
+            pylink.closeGraphics()
+
+    def _close_window(self):
+        """Close the PsychoPy window, if it was created."""
         try:
-            self.win.flip()  # flush win.callOnFlip() and win.timeOnFlip()
-            self.win.close()
+            if self._win is not None and not getattr(self._win, "_closed", False):
+                self._win.flip()  # flush win.callOnFlip() and win.timeOnFlip()
+                self._win.close()
         except Exception:
             pass
-        pylink.closeGraphics()
+
+
+def _screen_size(screen: int) -> tuple[int, int]:
+    """Read the size of a screen in pixels, without creating an OpenGL context."""
+    try:
+        from pyglet.canvas import Display
+
+        screens = Display().get_screens()
+    except Exception as error:
+        raise RuntimeError(
+            "The size of the screen could not be read. Provide the 'resolution' of "
+            "the screen."
+        ) from error
+    if len(screens) <= screen:
+        raise ValueError(
+            f"The screen {screen} does not exist, {len(screens)} screens are available."
+        )
+    return screens[screen].width, screens[screen].height
+
+
+def _check_edf_fname(pname: str | Path, fname: str) -> tuple[Path, str]:
+    """Check the EDF directory and file name, and create the directory."""
+    pname = ensure_path(pname, must_exist=False)
+    if not pname.exists():
+        os.makedirs(pname)
+    check_type(fname, (str,), "fname")
+    if fname.endswith(".EDF"):
+        fname = fname.split(".EDF")[0]
+    if 8 < len(fname):
+        raise ValueError("The fname should not exceed 8 alphanumeric characters.")
+    return pname, fname
+
+
+def _report_progress(
+    progress: Callable[[int, int, float], None] | None, size: int, received: int
+) -> int:
+    """Forward the EDF download progress reported by pylink."""
+    if progress is not None:
+        progress(received, size, 100 * received / size if 0 < size else 0.0)
+    return 0  # as the default pylink implementation
@@ -16,22 +16,81 @@ Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 Last updated on 5/13/2021
 """
 
-import array
-import os
 import platform
 import string
-import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, sleep
 
 import numpy
 import psychopy
 import pylink
-from PIL import Image, ImageDraw
+from PIL import Image
 from psychopy import core, event, logging, visual
 from psychopy.tools.coordinatetools import pol2cart
+from pyglet.window import key
+
+from ..utils._checks import ensure_path
+from ..utils._timing import StageTimer
 
 # Show only critical log message in the console
 logging.console.setLevel(logging.CRITICAL)
 
+# Key names, as reported by psychopy and pyglet, mapped to the pylink key codes.
+# Unlisted keys are sent as 0.
+_KEY_CODES = {
+    "f1": pylink.F1_KEY,
+    "f2": pylink.F2_KEY,
+    "f3": pylink.F3_KEY,
+    "f4": pylink.F4_KEY,
+    "f5": pylink.F5_KEY,
+    "f6": pylink.F6_KEY,
+    "f7": pylink.F7_KEY,
+    "f8": pylink.F8_KEY,
+    "f9": pylink.F9_KEY,
+    "f10": pylink.F10_KEY,
+    "pageup": pylink.PAGE_UP,
+    "pagedown": pylink.PAGE_DOWN,
+    "up": pylink.CURS_UP,
+    "down": pylink.CURS_DOWN,
+    "left": pylink.CURS_LEFT,
+    "right": pylink.CURS_RIGHT,
+    "backspace": ord("\b"),
+    "return": pylink.ENTER_KEY,
+    "space": ord(" "),
+    "escape": 27,
+    "tab": ord("\t"),
+    # Plus/equal & minus signs for CR adjustment
+    "num_add": ord("+"),
+    "equal": ord("+"),
+    "num_subtract": ord("-"),
+    "minus": ord("-"),
+}
+_KEY_CODES.update({letter: ord(letter) for letter in string.ascii_letters})
+
+
+def _load_picture(path):
+    """Decode a picture target."""
+    image = Image.open(path)
+    image.load()
+    return image
+
+
+def _modifier_code(mod):
+    """Convert pyglet key modifiers to the pylink modifier code."""
+    if mod & key.MOD_ALT:
+        return 256
+    elif mod & key.MOD_CTRL:
+        return 64
+    elif mod & key.MOD_SHIFT:
+        return 1
+    return 0
+
+
+# pylink modifier code for each combination of the pyglet modifiers shift (1),
+# ctrl (2) and alt (4)
+_MODIFIER_CODES = tuple(_modifier_code(mod) for mod in range(8))
+
 
 class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
     """Constructor for Custom EyeLinkCoreGraphics.
@@ -65,10 +124,34 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         if self._units != "pix":
             self._display.setUnits("pix")
 
-        # Camera image set up
-        self._imagebuffer = array.array("I")
+        # Camera image set up, the frame buffers are (re)allocated in
+        # setup_image_display() and reused across camera frames. Lines are
+        # decoded in the back buffer, swapped with the front buffer once a
+        # frame is complete.
+        self._imagebuffer = numpy.zeros((0, 0), dtype=numpy.uint32)
+        self._frontbuffer = numpy.zeros((0, 0), dtype=numpy.uint32)
+        self._frameShape = None  # (width, height) of the frame in the front buffer
+        self._framePending = False  # front buffer not rendered yet?
+        # Latest-frame-wins: when enabled, a complete frame is rendered only if
+        # a display refresh elapsed since the last rendered frame, else it waits
+        # in the front buffer and is replaced by newer frames.
+        self._coalesceFrames = False
+        self._lastFrameRender = -numpy.inf
+        self._framesReceived = 0
+        self._framesRendered = 0
+        self._framesDropped = 0
+
+        # Opt-in timing of the stages of the display, c.f.
+        # setTimingInstrumentation()
+        self._timer = None
+        self._logTimings = False
+        self._decodeTime = 0.0  # decoding time accumulated over a camera frame
         self._pal = None  # color palette to use for camera image drawing
+        self._palCache = {}  # lookup tables keyed by palette content
         self._size = (384, 320)
+        # long-lived stimulus displaying the camera image, created in
+        # setup_image_display() and released in exit_image_display()
+        self._imgStim = None
 
         # Initial setup for the mouse
         self._mouse = event.Mouse(False)
@@ -146,15 +229,53 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         self._calTarget = "circle"
         # A switch to turn on/off the animated target
         self._animatedTarget = False
+        # Animated targets are redrawn once per display refresh from
+        # get_input_key(), c.f. _animate_target()
+        self._lastAnimationFlip = None
+        self._nextAnimationFlip = -numpy.inf
+        self._animationFrames = 0
+        self._missedFlips = 0
+        # Flip budget of the calibration display, c.f. _flip_cal_display()
+        self._calFlips = 0
+        self._calTargets = 0
         self._movieTarget = None
         self._pictureTarget = None
+        # The picture is decoded in a background thread as soon as it is set,
+        # c.f. _preload_target_asset()
+        self._assetLoader = None
+        self._pictureAsset = None
+        self._tarOuter = None
+        self._tarInner = None
+        self._calibTar = None
+        # Prepared target stimuli, keyed on the target configuration and
+        # invalidated by the target setters, c.f. _target_cache_key()
+        self._targetCache = {}
 
         # A reference to the tracker connection
         self._tracker = tracker
 
+        # Key presses are pushed by a window handler in a queue drained by
+        # get_input_key(), c.f. _on_key_press()
+        self._keyQueue = deque()
+        self._keyHandlersInstalled = False
+        self._mouseSimRequest = None  # time of the pending mouse simulation probe
+
         # The tracker is running in mouse simulation mode?
         self._mouse_simulation = False
-        self.imgResize = None
+        # Size of the camera image on screen, upscaled by the camera stimulus
+        self._camDisplaySize = None
+
+        # Crosshair and search limit overlays are drawn on top of the camera
+        # image with pools of vector stimuli reused from one frame to the next.
+        # Coordinates are mapped from the camera image to the window with
+        # _camScale and _camOffset, updated once per frame.
+        self._overlayLines = []
+        self._overlayShapes = []
+        self._nOverlayLines = 0
+        self._nOverlayShapes = 0
+        self._camScale = (1.0, -1.0)
+        self._camOffset = (0.0, 0.0)
+        self._arcAngles = numpy.deg2rad(numpy.linspace(0, 180, 16))
 
     def __str__(self):
         """Overwrite __str__ to show information about the CoreGraphicsPsychoPy lib."""
@@ -191,6 +312,7 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         """
         self._foregroundColor = foreground_color
         self._backgroundColor = background_color
+        self._targetCache.clear()
 
         # Update the color of the visual elements
         self._title.color = foreground_color
@@ -202,6 +324,7 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
     def setTargetSize(self, size):
         """Set calibration target size in pixels."""
         self._targetSize = size
+        self._targetCache.clear()
 
     def setTargetType(self, type):  # noqa: A002
         """Set calibration target size in pixels.
@@ -211,62 +334,190 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         type: "circle" (default), "picture", "movie", "spiral"
         """
         self._calTarget = type
+        self._targetCache.clear()
 
     def setMoiveTarget(self, movie_target):
-        """Set the movie file to use as the calibration target."""
+        """Set the movie file to use as the calibration target.
+
+        The movie is opened by :meth:`waitTargetAssets`, before the calibration.
+        """
+        movie_target = str(ensure_path(movie_target, must_exist=True))
         self._movieTarget = movie_target
+        self._targetCache.clear()
 
     def setPictureTarget(self, picture_target):
-        """Set the movie file to use as the calibration target."""
+        """Set the picture file to use as the calibration target.
+
+        The picture is decoded in a background thread.
+        """
+        picture_target = str(ensure_path(picture_target, must_exist=True))
         self._pictureTarget = picture_target
+        self._targetCache.clear()
+        # the future of a previous picture is dropped with it
+        self._pictureAsset = self._preload_target_asset(picture_target, _load_picture)
+
+    def _preload_target_asset(self, path, loader):
+        """Load a target asset in the background thread and return its future."""
+        if self._assetLoader is None:
+            self._assetLoader = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="eyelink-target-asset"
+            )
+        return self._assetLoader.submit(loader, path)
+
+    def waitTargetAssets(self, timeout=None):
+        """Wait for the target assets to be loaded and prepare the target stimuli.
+
+        The stimuli, e.g. the picture texture or the movie, are created on the
+        calling thread, which must own the window, and cached such that entering
+        the calibration does not stall on them.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time to wait for the picture, in seconds.
+
+        Raises
+        ------
+        Exception
+            The error raised while loading the picture, if it is the target.
+        """
+        if self._calTarget == "picture" and self._pictureAsset is not None:
+            self._pictureAsset.result(timeout)
+        self.update_cal_target()
+
+    def setCameraFrameCoalescing(self, enabled):
+        """Render only the newest complete camera frame.
+
+        Parameters
+        ----------
+        enabled : bool
+            If True, camera frames completed less than a display refresh after
+            the last rendered frame are not rendered immediately. The newest one
+            is rendered as soon as the display can take it and the stale ones
+            are dropped, which bounds the lag of the camera preview.
+        """
+        self._coalesceFrames = bool(enabled)
+
+    def getAnimationStats(self):
+        """Get the number of animated target frames drawn and of missed flips."""
+        return dict(frames=self._animationFrames, missed_flips=self._missedFlips)
+
+    def getCameraFrameStats(self):
+        """Get the number of camera frames received, rendered and dropped."""
+        return dict(
+            received=self._framesReceived,
+            rendered=self._framesRendered,
+            dropped=self._framesDropped,
+        )
+
+    def setTimingInstrumentation(self, enabled, capacity=1024, log=True):
+        """Record the duration of each stage of the display.
+
+        Parameters
+        ----------
+        enabled : bool
+            If True, the durations of the camera frame decoding (``'decode'``), the
+            texture upload (``'upload'``), the overlay drawing (``'overlay'``), the
+            window flips (``'flip'``) and the key polling (``'input'``) are recorded
+            in ring buffers of ``capacity`` elements.
+        capacity : int
+            Number of durations kept per stage.
+        log : bool
+            If True, the summary of the durations is logged when exiting the
+            calibration display.
+        """
+        if enabled:
+            self._timer = StageTimer(
+                ("decode", "upload", "overlay", "flip", "input"), capacity
+            )
+        else:
+            self._timer = None
+        self._logTimings = bool(log)
+
+    def getTimingSummary(self):
+        """Get the percentiles (p50, p95, p99) and maximum of each stage in ms."""
+        return dict() if self._timer is None else self._timer.summary()
+
+    def _record_timing(self, stage, start):
+        """Record the duration of a stage started at start, if instrumented."""
+        if self._timer is not None:
+            self._timer.record_since(stage, start)
+
+    def _flip(self):
+        """Flip the window."""
+        start = perf_counter()
+        self._display.flip()
+        self._record_timing("flip", start)
+
+    def _target_cache_key(self):
+        """Key identifying the prepared target stimuli in the cache."""
+        asset = {"picture": self._pictureTarget, "movie": self._movieTarget}
+        return (
+            self._calTarget,
+            self._targetSize,
+            tuple(numpy.ravel(self._foregroundColor).tolist()),
+            tuple(numpy.ravel(self._backgroundColor).tolist()),
+            asset.get(self._calTarget),
+        )
 
     def update_cal_target(self):
-        """Make sure target stimuli is in memory when being used by draw_cal_target."""
+        """Make sure target stimuli is in memory when being used by draw_cal_target.
+
+        The stimuli are prepared once per target configuration and reused when
+        re-entering the calibration, validation or drift-check.
+        """
+        cacheKey = self._target_cache_key()
+        if cacheKey in self._targetCache:
+            self._tarOuter, self._tarInner, self._calibTar = self._targetCache[cacheKey]
+            return
+
         if self._calTarget == "picture":
             if self._pictureTarget is None:
-                print("ERROR: Provide a picture as the calibration target")  # noqa: T201
-                core.quit()
-                sys.exit()
-            else:
-                if os.path.exists(self._pictureTarget):
-                    self._calibTar = visual.ImageStim(
-                        self._display, self._pictureTarget
-                    )
-                else:
-                    print(f"ERROR: Picture {self._pictureTarget} not found.")  # noqa: T201
-                    self._display.close()
-                    core.quit()
+                raise RuntimeError(
+                    "Provide a picture as the calibration target with "
+                    "setPictureTarget()."
+                )
+            # decoded in the background by setPictureTarget()
+            image = self._pictureAsset.result()
+            self._calibTar = visual.ImageStim(self._display, image)
         elif self._calTarget == "spiral":
+            # The 144 gratings of the spiral are rendered once into a single
+            # texture, animated by rotating it.
             thetas = numpy.arange(0, 1440, 10)
             N = len(thetas)
             radii = numpy.linspace(0, 1.0, N) * self._targetSize
             x, y = pol2cart(theta=thetas, radius=radii)
             xys = numpy.array([x, y]).transpose()
-            self._calibTar = visual.ElementArrayStim(
+            spiral = visual.ElementArrayStim(
                 self._display,
+                units="pix",
                 nElements=N,
                 sizes=self._targetSize,
                 sfs=3.0,
                 xys=xys,
                 oris=-thetas,
             )
+            # gratings of size targetSize are placed up to a radius targetSize
+            w, h = self._display.size
+            ex = 1.5 * self._targetSize / (w / 2.0)
+            ey = 1.5 * self._targetSize / (h / 2.0)
+            self._calibTar = visual.BufferImageStim(
+                self._display, stim=[spiral], rect=(-ex, ey, ex, -ey)
+            )
+            self._display.clearBuffer()
 
         elif self._calTarget == "movie":
             if self._movieTarget is None:
-                print("ERROR: Provide a movie clip as the calibration target")  # noqa: T201
-                core.quit()
-            else:
-                if os.path.exists(self._movieTarget):
-                    self._calibTar = visual.MovieStim3(
-                        self._display,
-                        self._movieTarget,
-                        noAudio=False,
-                        loop=True,
-                    )
-                else:
-                    print(f"ERROR: Movie {self._movieTarget} not found")  # noqa: T201
-                    self._display.close()
-                    core.quit()
+                raise RuntimeError(
+                    "Provide a movie clip as the calibration target with "
+                    "setMoiveTarget()."
+                )
+            self._calibTar = visual.MovieStim3(
+                self._display,
+                self._movieTarget,
+                noAudio=False,
+                loop=True,
+            )
         else:  # Use the default target 'circle'
             self._tarOuter = visual.GratingStim(
                 self._display,
@@ -284,6 +535,7 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
                 color=self._backgroundColor,
                 units="pix",
             )
+        self._targetCache[cacheKey] = (self._tarOuter, self._tarInner, self._calibTar)
 
     def setup_cal_display(self):
         """Set up the calibration display before entering the calibration/validation."""
@@ -293,16 +545,36 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         self._animatedTarget = False
         self.update_cal_target()
 
-    def clear_cal_display(self):
-        """Clear the calibration display."""
+    def _reset_cal_display(self):
+        """Hide the calibration display elements, effective on the next flip."""
         self._calibInst.autoDraw = False
         self._title.autoDraw = False
         self._msgMouseSim.autoDraw = False
         self._camImgRect.autoDraw = False
 
         self._display.color = self._backgroundColor
-        self._display.flip()
-        self._display.color = self._backgroundColor
+
+    def _flip_cal_display(self):
+        """Flip the window to show a new state of the calibration display.
+
+        Each visible state change (target drawn, erased, display cleared) is shown
+        with exactly one flip, counted in the flip budget.
+        """
+        self._flip()
+        self._calFlips += 1
+
+    def getFlipStats(self):
+        """Get the number of flips issued per calibration target."""
+        return dict(
+            flips=self._calFlips,
+            targets=self._calTargets,
+            flips_per_target=self._calFlips / max(self._calTargets, 1),
+        )
+
+    def clear_cal_display(self):
+        """Clear the calibration display."""
+        self._reset_cal_display()
+        self._flip_cal_display()
 
     def exit_cal_display(self):
         """Exit the calibration/validation routine.
@@ -311,7 +583,10 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         """
         self._display.setUnits(self._units)
         self._animatedTarget = False
+        self.releaseKeyboard()
         self.clear_cal_display()
+        if self._timer is not None and self._logTimings:
+            self._timer.log_summary("Calibration display")
 
     def record_abort_hide(self):
         """This function is called if aborted."""  # noqa: D401, D404
@@ -322,15 +597,17 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
             self._calibTar.pause()
         except Exception:
             pass
-        self.clear_cal_display()
         self._animatedTarget = False
-        self._display.flip()
+        # the back buffer is cleared by the previous flip, a single flip erases
+        # the target
+        self._reset_cal_display()
+        self._flip_cal_display()
 
     def draw_cal_target(self, x, y):
         """Draw the calibration/validation & drift-check target."""
-        self._calibInst.autoDraw = False
-
-        self.clear_cal_display()
+        self._calTargets += 1
+        # the previous display is replaced by the target with a single flip
+        self._reset_cal_display()
         xVis = x - self._w / 2.0
         yVis = self._h / 2.0 - y
 
@@ -338,8 +615,6 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         if self._calTarget == "circle":
             self._tarOuter.pos = (xVis, yVis)
             self._tarInner.pos = (xVis, yVis)
-        elif self._calTarget == "spiral":
-            self._calibTar.fieldPos = (xVis, yVis)
         else:
             if self._calibTar is not None:
                 self._calibTar.pos = (xVis, yVis)
@@ -348,16 +623,18 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         if self._calTarget in ["spiral", "movie"]:
             # Hand over drawing to get_input_key()
             self._animatedTarget = True
+            self._lastAnimationFlip = None
+            self._nextAnimationFlip = -numpy.inf
             if self._calTarget == "movie":
                 if self._calibTar is not None:
                     self._calibTar.play()
         elif self._calTarget == "picture":
             self._calibTar.draw()
-            self._display.flip()
+            self._flip_cal_display()
         else:
             self._tarOuter.draw()
             self._tarInner.draw()
-            self._display.flip()
+            self._flip_cal_display()
 
     def getColorFromIndex(self, colorindex):
         """Return psychopy colors for elements in the camera image."""
@@ -374,73 +651,94 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         else:
             return (128, 128, 128)
 
-    def draw_line(self, x1, y1, x2, y2, colorindex):
-        """Draw a line. This is used for drawing crosshairs/squares."""
-        color = self.getColorFromIndex(colorindex)
-
+    def _set_overlay_transform(self, width, height, display_size):
+        """Map camera coordinates onto the displayed image and rewind overlay pools."""
+        # crosshair coordinates are given in a 192 x 160 space for large images
         if self._size[0] > 192:
-            w, h = self._img.im.size
-            x1 = int((float(x1) / 192) * w)
-            x2 = int((float(x2) / 192) * w)
-            y1 = int((float(y1) / 160) * h)
-            y2 = int((float(y2) / 160) * h)
+            ref_w, ref_h = 192, 160
+        else:
+            ref_w, ref_h = width, height
+        dw, dh = display_size
+        self._camScale = (dw / ref_w, -dh / ref_h)
+        self._camOffset = (-dw / 2.0, dh / 2.0)
+        self._nOverlayLines = 0
+        self._nOverlayShapes = 0
+
+    def _next_overlay(self, pool, idx, create):
+        """Return the idx-th stimulus of an overlay pool, creating it if needed."""
+        if idx == len(pool):
+            pool.append(create())
+        return pool[idx]
+
+    def _create_overlay_line(self):
+        """Create a line stimulus for the camera image overlays."""
+        return visual.Line(self._display, units="pix", lineWidth=1, colorSpace="rgb255")
+
+    def _create_overlay_shape(self):
+        """Create a closed shape stimulus for the camera image overlays."""
+        return visual.ShapeStim(
+            self._display,
+            units="pix",
+            lineWidth=1,
+            colorSpace="rgb255",
+            fillColor=None,
+            closeShape=True,
+        )
 
-        # draw the line
-        if not any([x < 0 for x in [x1, x2, y1, y2]]):
-            self._img.line([(x1, y1), (x2, y2)], color)
+    def draw_line(self, x1, y1, x2, y2, colorindex):
+        """Draw a line. This is used for drawing crosshairs/squares."""
+        if any([x < 0 for x in [x1, x2, y1, y2]]):
+            return
+        sx, sy = self._camScale
+        ox, oy = self._camOffset
+        line = self._next_overlay(
+            self._overlayLines,
+            self._nOverlayLines,
+            self._create_overlay_line,
+        )
+        self._nOverlayLines += 1
+        line.start = (x1 * sx + ox, y1 * sy + oy)
+        line.end = (x2 * sx + ox, y2 * sy + oy)
+        line.lineColor = self.getColorFromIndex(colorindex)
+        line.draw()
 
     def draw_lozenge(self, x, y, width, height, colorindex):
         """Draw a lozenge to show the defined search limits.
 
         (x,y) is top-left corner of the bounding box.
         """
-        color = self.getColorFromIndex(colorindex)
-
-        if self._size[0] > 192:
-            w, h = self._img.im.size
-            x = int((float(x) / 192) * w)
-            y = int((float(y) / 160) * h)
-            width = int((float(width) / 192) * w)
-            height = int((float(height) / 160) * h)
-
+        # the lozenge is made of 2 half-circles joined by straight lines, the
+        # angles follow the image convention (y-axis pointing down)
         if width > height:
-            rad = int(height / 2.0)
-            if rad == 0:
-                return
-            else:
-                self._img.line([(x + rad, y), (x + width - rad, y)], color, 1)
-                self._img.line(
-                    [(x + rad, y + height), (x + width - rad, y + height)],
-                    color,
-                    1,
-                )
-                self._img.arc([x, y, x + rad * 2, y + rad * 2], 90, 270, color, 1)
-                self._img.arc(
-                    [x + width - rad * 2, y, x + width, y + height],
-                    270,
-                    90,
-                    color,
-                    1,
-                )
+            rad = height / 2.0
+            centers = ((x + rad, y + rad), (x + width - rad, y + rad))
+            starts = (90, 270)
         else:
-            rad = int(width / 2.0)
-            if rad == 0:
-                return
-            else:
-                self._img.line([(x, y + rad), (x, y + height - rad)], color, 1)
-                self._img.line(
-                    [(x + width, y + rad), (x + width, y + height - rad)],
-                    color,
-                    1,
-                )
-                self._img.arc([x, y, x + rad * 2, y + rad * 2], 180, 360, color, 1)
-                self._img.arc(
-                    [x, y + height - rad * 2, x + rad * 2, y + height],
-                    0,
-                    180,
-                    color,
-                    1,
-                )
+            rad = width / 2.0
+            centers = ((x + rad, y + rad), (x + rad, y + height - rad))
+            starts = (180, 0)
+        if int(rad) == 0:
+            return
+        xs = []
+        ys = []
+        for (cx, cy), start in zip(centers, starts, strict=True):
+            angles = self._arcAngles + numpy.deg2rad(start)
+            xs.append(cx + rad * numpy.cos(angles))
+            ys.append(cy + rad * numpy.sin(angles))
+        sx, sy = self._camScale
+        ox, oy = self._camOffset
+        vertices = numpy.column_stack(
+            (numpy.concatenate(xs) * sx + ox, numpy.concatenate(ys) * sy + oy)
+        )
+        shape = self._next_overlay(
+            self._overlayShapes,
+            self._nOverlayShapes,
+            self._create_overlay_shape,
+        )
+        self._nOverlayShapes += 1
+        shape.vertices = vertices
+        shape.lineColor = self.getColorFromIndex(colorindex)
+        shape.draw()
 
     def get_mouse_state(self):
         """Get the current mouse position and status."""
@@ -461,100 +759,124 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         # This function is constantly checked by the API,
         # so we could update the gabor here
         if self._animatedTarget:
-            if self._calTarget == "spiral":
-                self._calibTar.phases -= 0.02
-            self._calibTar.draw()
-            self._display.flip()
+            self._animate_target()
+
+        # Render the newest camera frame held back by the frame coalescing
+        if self._framePending and self._imgStim is not None and self._frame_due():
+            self._render_camera_frame()
+
+        # Reply to the mouse simulation probe sent when ENTER was pressed
+        if self._mouseSimRequest is not None:
+            self._poll_mouse_simulation()
+
+        start = perf_counter()
+        if self._install_key_handlers():
+            # key presses are pushed in the queue by _on_key_press()
+            self._display.winHandle.dispatch_events()
+        else:
+            for keycode, modifier in event.getKeys(modifiers=True):
+                mod = (
+                    key.MOD_ALT * modifier["alt"]
+                    | key.MOD_CTRL * modifier["ctrl"]
+                    | key.MOD_SHIFT * modifier["shift"]
+                )
+                self._keyQueue.append((keycode, mod))
 
         ky = []
-        for keycode, modifier in event.getKeys(modifiers=True):
+        while self._keyQueue:
+            keycode, mod = self._keyQueue.popleft()
             self._display.mouseVisible = False  # set mouse cursor invisible
-            k = pylink.JUNK_KEY
-            if keycode == "f1":
-                k = pylink.F1_KEY
-            elif keycode == "f2":
-                k = pylink.F2_KEY
-            elif keycode == "f3":
-                k = pylink.F3_KEY
-            elif keycode == "f4":
-                k = pylink.F4_KEY
-            elif keycode == "f5":
-                k = pylink.F5_KEY
-            elif keycode == "f6":
-                k = pylink.F6_KEY
-            elif keycode == "f7":
-                k = pylink.F7_KEY
-            elif keycode == "f8":
-                k = pylink.F8_KEY
-            elif keycode == "f9":
-                k = pylink.F9_KEY
-            elif keycode == "f10":
-                k = pylink.F10_KEY
-            elif keycode == "pageup":
-                k = pylink.PAGE_UP
-            elif keycode == "pagedown":
-                k = pylink.PAGE_DOWN
-            elif keycode == "up":
-                k = pylink.CURS_UP
-            elif keycode == "down":
-                k = pylink.CURS_DOWN
-            elif keycode == "left":
-                k = pylink.CURS_LEFT
-            elif keycode == "right":
-                k = pylink.CURS_RIGHT
-            elif keycode == "backspace":
-                k = ord("\b")
-            elif keycode == "return":
-                k = pylink.ENTER_KEY
+            if keycode == "return":
                 # Probe the tracker to see if it's "simulating gaze with mouse"
                 # If so, show a warning to experimenter
                 if self._tracker.getCurrentMode() == pylink.IN_SETUP_MODE:
                     self._tracker.readRequest("aux_mouse_simulation")
-                    pylink.pumpDelay(50)
-                    if self._tracker.readReply() == "1":
-                        self._msgMouseSim.autoDraw = True
-                        self._camImgRect.autoDraw = True
-                        self._calibInst.autoDraw = True
-                        self._display.flip()
-            elif keycode == "space":
-                k = ord(" ")
-            elif keycode == "escape":
-                k = 27
-            elif keycode == "tab":
-                k = ord("\t")
-            elif keycode in string.ascii_letters:
-                k = ord(keycode)
-            elif k == pylink.JUNK_KEY:
-                k = 0
-
-            # Plus/equal & minux signs for CR adjustment
-            if keycode in ["num_add", "equal"]:
-                k = ord("+")
-            if keycode in ["num_subtract", "minus"]:
-                k = ord("-")
-
+                    self._mouseSimRequest = core.getTime()
             # Handles key modifier, we can send Ctrl-C, Alt-F4
             # to break out trials, or terminate tasks
-            if modifier["alt"] is True:
-                mod = 256
-            elif modifier["ctrl"] is True:
-                mod = 64
-            elif modifier["shift"] is True:
-                mod = 1
-            else:
-                mod = 0
-
-            ky.append(pylink.KeyInput(k, mod))
+            ky.append(
+                pylink.KeyInput(_KEY_CODES.get(keycode, 0), _MODIFIER_CODES[mod & 7])
+            )
 
+        self._record_timing("input", start)
         return ky
 
+    def _poll_mouse_simulation(self):
+        """Check the reply to the mouse simulation probe without blocking."""
+        reply = self._tracker.readReply()
+        if reply:
+            self._mouseSimRequest = None
+            if reply == "1":
+                self._msgMouseSim.autoDraw = True
+                self._camImgRect.autoDraw = True
+                self._calibInst.autoDraw = True
+                self._flip()
+        elif 0.5 < core.getTime() - self._mouseSimRequest:
+            self._mouseSimRequest = None  # give up on the probe
+
+    def _install_key_handlers(self):
+        """Push the key press handler on the pyglet window, if possible."""
+        if not self._keyHandlersInstalled and hasattr(
+            self._display.winHandle, "push_handlers"
+        ):
+            self._display.winHandle.push_handlers(on_key_press=self._on_key_press)
+            self._keyHandlersInstalled = True
+        return self._keyHandlersInstalled
+
+    def _on_key_press(self, symbol, modifiers):
+        """Push the pressed key in the key queue."""
+        self._keyQueue.append((key.symbol_string(symbol).lower(), modifiers))
+        return True  # handled, the key does not reach the psychopy event buffer
+
+    def releaseKeyboard(self):
+        """Remove the key press handler from the window.
+
+        Key presses reach again the psychopy event module, e.g. for
+        :func:`psychopy.event.waitKeys`. The handler is pushed back on the window
+        the next time the tracker polls for key presses.
+        """
+        if self._keyHandlersInstalled:
+            self._display.winHandle.remove_handlers(on_key_press=self._on_key_press)
+            self._keyHandlersInstalled = False
+        self._keyQueue.clear()
+
+    def _animate_target(self):
+        """Draw the next frame of the animated target, once per display refresh.
+
+        Between refreshes, the polling thread sleeps until shortly before the next
+        refresh instead of spinning. The flip is aligned on the vertical sync and
+        the refreshes elapsed without a new frame are counted as missed flips.
+        """
+        period = self._display.monitorFramePeriod
+        remaining = self._nextAnimationFlip - core.getTime()
+        if 0.002 < remaining:
+            # wake up ahead of the refresh to leave time to draw the frame, the
+            # flip then blocks until the vertical sync
+            sleep(remaining - 0.002)
+            return
+        if self._calTarget == "spiral":
+            self._calibTar.ori = (self._calibTar.ori - 3) % 360
+        self._calibTar.draw()
+        self._flip()
+        now = core.getTime()
+        if self._lastAnimationFlip is not None:
+            missed = round((now - self._lastAnimationFlip) / period) - 1
+            self._missedFlips += max(missed, 0)
+        self._lastAnimationFlip = now
+        self._nextAnimationFlip = now + period
+        self._animationFrames += 1
+
     def exit_image_display(self):
         """Clear the camera image."""
+        self._imgStim = None  # release the camera texture
+        if self._framePending:
+            self._framesDropped += 1
+            self._framePending = False
         self._calibInst.autoDraw = True
         self._title.autoDraw = False
         self._msgMouseSim.autoDraw = False
         self._camImgRect.autoDraw = False
-        self._display.flip()
+        self._flip()
 
     def alert_printf(self, msg):
         """Print error messages."""
@@ -572,59 +894,116 @@ class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
         self._camImgRect.autoDraw = False
 
         self._size = (width, height)
+        self._allocate_image_buffer(width, height)
+        self._create_camera_stim()
 
         return 1
 
     def image_title(self, text):
         """Draw title text below the camera image."""
-        if self.imgResize is not None:
-            im_w, im_h = self.imgResize.size
+        if self._camDisplaySize is not None:
+            im_w, im_h = self._camDisplaySize
             self._title.pos = (0, -im_h / 2.0 - self._msgHeight)
         else:
             self._title.pos = (0, -self._size[1] / 2 - self._msgHeight)
         self._title.text = text
 
+    def _create_camera_stim(self):
+        """Create the stimulus displaying the camera image if it does not exist."""
+        if self._imgStim is None:
+            self._imgStim = visual.ImageStim(self._display, image=None, units="pix")
+
+    def _allocate_image_buffer(self, width, height):
+        """Grow the uint32 frame buffers if they can not hold a width x height frame."""
+        rows, cols = self._imagebuffer.shape
+        if rows < height or cols < width:
+            self._imagebuffer = numpy.zeros(
+                (max(rows, height), max(cols, width)), dtype=numpy.uint32
+            )
+        rows, cols = self._frontbuffer.shape
+        if rows < height or cols < width:
+            self._frontbuffer = numpy.zeros_like(self._imagebuffer)
+
     def draw_image_line(self, width, line, totlines, buff):
-        """Display image pixel by pixel, line by line."""
-        i = 0
-        for i in range(width):
-            try:
-                self._imagebuffer.append(self._pal[buff[i]])
-            except Exception:
-                pass
+        """Display image line by line, decoding each line with one palette lookup."""
+        if self._pal is None:
+            return
+        start = perf_counter()
+        self._allocate_image_buffer(width, totlines)
+        try:
+            indices = numpy.frombuffer(buff, dtype=numpy.uint8, count=width)
+        except TypeError:  # buff is a sequence of palette indices
+            indices = numpy.asarray(buff[:width], dtype=numpy.uint8)
+        # lines are numbered from 1 to totlines, out-of-range palette indices are
+        # clipped instead of raising
+        numpy.take(
+            self._pal, indices, out=self._imagebuffer[line - 1, :width], mode="clip"
+        )
+        self._decodeTime += perf_counter() - start
 
         if line == totlines:
-            bufferv = self._imagebuffer.tobytes()
-            img = Image.frombytes("RGBX", (width, totlines), bufferv)
-            self._img = ImageDraw.Draw(img)
-            self.draw_cross_hair()
-            self.imgResize = img.resize((width * 2, totlines * 2))
-            imgResizeVisual = visual.ImageStim(
-                self._display, image=self.imgResize, units="pix"
-            )
-            imgResizeVisual.draw()
-            # Change the position of the camera title
-            self._title.pos = (0, -totlines * 2 / 2.0 - self._msgHeight)
-            self._display.flip()
-            self._imagebuffer = array.array("I")
+            if self._timer is not None:
+                self._timer.record("decode", self._decodeTime)
+            self._decodeTime = 0.0
+            self._framesReceived += 1
+            if self._framePending:  # the previous frame was never rendered
+                self._framesDropped += 1
+            self._imagebuffer, self._frontbuffer = self._frontbuffer, self._imagebuffer
+            self._frameShape = (width, totlines)
+            self._framePending = True
+            if not self._coalesceFrames or self._frame_due():
+                self._render_camera_frame()
+
+    def _frame_due(self):
+        """Check if a display refresh elapsed since the last rendered camera frame."""
+        elapsed = core.getTime() - self._lastFrameRender
+        return self._display.monitorFramePeriod <= elapsed
+
+    def _render_camera_frame(self):
+        """Render the camera frame held in the front buffer."""
+        width, totlines = self._frameShape
+        start = perf_counter()
+        frame = numpy.ascontiguousarray(self._frontbuffer[:totlines, :width])
+        img = Image.frombuffer("RGBX", (width, totlines), frame, "raw", "RGBX", 0, 1)
+        self._create_camera_stim()
+        # upload the new frame into the existing texture, the 2x upscaling is
+        # done on the GPU through the size of the stimulus
+        self._imgStim.image = img
+        self._camDisplaySize = (width * 2, totlines * 2)
+        if tuple(self._imgStim.size) != self._camDisplaySize:
+            self._imgStim.size = self._camDisplaySize
+        self._imgStim.draw()
+        self._record_timing("upload", start)
+        # draw the crosshair and search limits on top of the camera image
+        start = perf_counter()
+        self._set_overlay_transform(width, totlines, self._camDisplaySize)
+        self.draw_cross_hair()
+        self._record_timing("overlay", start)
+        # Change the position of the camera title
+        self._title.pos = (0, -totlines * 2 / 2.0 - self._msgHeight)
+        self._flip()
+        self._framePending = False
+        self._framesRendered += 1
+        self._lastFrameRender = core.getTime()
 
     def set_image_palette(self, r, g, b):
-        """For a set of RGB colors, create a list of 24bit int representing the pallet.
+        """For a set of RGB colors, create a uint32 table representing the pallet.
 
-        i.e., RGB of (1,64,127) would be saved as 82047,
-        or the number 00000001 01000000 011111111
+        i.e., RGB of (1,64,127) would be saved as 8339457,
+        or the number 01111111 01000000 00000001 (BGR, read as RGBX bytes).
+        Tables are cached by palette content as the tracker pushes the same
+        palettes over and over.
         """
-        self._imagebuffer = array.array("I")
-
-        sz = len(r)
-        i = 0
-        self._pal = []
-        while i < sz:
-            rf = int(b[i])
-            gf = int(g[i])
-            bf = int(r[i])
-            self._pal.append((rf << 16) | (gf << 8) | (bf))
-            i = i + 1
+        cacheKey = (tuple(r), tuple(g), tuple(b))
+        pal = self._palCache.get(cacheKey)
+        if pal is None:
+            rgb = numpy.asarray(cacheKey, dtype=numpy.uint32)
+            pal = (rgb[2] << 16) | (rgb[1] << 8) | rgb[0]
+            pal.flags.writeable = False
+            if len(self._palCache) == 8:  # drop the oldest palette
+                del self._palCache[next(iter(self._palCache))]
+            self._palCache[cacheKey] = pal
+        self._pal = pal
 
     def play_beep(*args, **kwargs):
         """Dummy play_beep method."""  # noqa: D401
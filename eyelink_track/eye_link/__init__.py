@@ -1,3 +1,23 @@
 """Eye-link module."""
 
-from .EyeLink import Eyelink
+from typing import TYPE_CHECKING
+
+from ..utils._imports import lazy_attributes
+
+# pylink, and PsychoPy for the calibration, are only loaded on first access
+__getattr__, __dir__, __all__ = lazy_attributes(
+    __name__,
+    attributes={
+        "ClockModel": "..utils._clock",
+        "Eyelink": ".EyeLink",
+        "LinkEvent": "._stream",
+        "SAMPLE_DTYPE": "._stream",
+        "SimulatedEyeLink": "._simulated",
+    },
+)
+
+if TYPE_CHECKING:
+    from ..utils._clock import ClockModel
+    from ._simulated import SimulatedEyeLink
+    from ._stream import SAMPLE_DTYPE, LinkEvent
+    from .EyeLink import Eyelink
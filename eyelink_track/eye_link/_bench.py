@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import ensure_int
+from ..utils.logs import logger
+from ._simulated import SimulatedEyeLink, camera_frames, camera_palette
+from ._stream import LinkReader
+from .EyeLink import Eyelink
+
+if TYPE_CHECKING:
+    from psychopy.visual import Window
+
+    from .EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+
+
+def run_benchmarks(screen: int = 0, graphics: bool = True) -> dict[str, dict]:
+    """Measure the performance of the machine against the simulated tracker.
+
+    Parameters
+    ----------
+    screen : int
+        ID of the screen on which the calibration window is created.
+    graphics : bool
+        If True, the flip interval and the camera preview are measured in the
+        calibration window, which requires PsychoPy.
+
+    Returns
+    -------
+    results : dict
+        Dictionary mapping ``'flip'``, ``'camera'``, ``'message'`` and ``'drain'``
+        to the metrics of each benchmark. ``'flip'`` and ``'camera'`` are missing
+        if ``graphics`` is False.
+    """
+    screen = ensure_int(screen, "screen")
+    results = dict()
+    tracker = SimulatedEyeLink(seed=0)
+    with TemporaryDirectory(prefix="eyelink_track-bench-") as pname:
+        # without window, the screen size does not matter to the simulated tracker
+        eye_link = Eyelink(
+            pname,
+            "BENCH",
+            screen=screen,
+            resolution=None if graphics else (1920, 1080),
+            tracker=tracker,
+        )
+        try:
+            if graphics:
+                results["flip"] = bench_flip(eye_link.win)
+                results["camera"] = bench_camera(eye_link.genv)
+            results["message"] = bench_message(eye_link)
+        finally:
+            eye_link.close()
+    results["drain"] = bench_drain()
+    return results
+
+
+def bench_flip(win: Window, n_flips: int = 240) -> dict[str, float]:
+    """Measure the interval between consecutive flips of a window.
+
+    Parameters
+    ----------
+    win : Window
+        The PsychoPy window.
+    n_flips : int
+        Number of flips measured.
+
+    Returns
+    -------
+    results : dict
+        The median interval ``interval_ms``, its standard deviation ``jitter_ms``
+        and its 99th percentile ``p99_ms``, in milliseconds, and the number of
+        intervals longer than 1.5 times the median ``missed``.
+    """
+    stamps = np.empty(n_flips + 1)
+    win.flip()  # synchronize on the first refresh
+    for k in range(stamps.size):
+        win.flip()
+        stamps[k] = perf_counter()
+    intervals = np.diff(stamps) * 1e3
+    median = np.median(intervals)
+    return dict(
+        interval_ms=float(median),
+        jitter_ms=float(intervals.std()),
+        p99_ms=float(np.percentile(intervals, 99)),
+        missed=int(np.sum(1.5 * median < intervals)),
+    )
+
+
+def bench_camera(
+    genv: EyeLinkCoreGraphicsPsychoPy,
+    size: tuple[int, int] = (192, 160),
+    n_frames: int = 240,
+) -> dict[str, float]:
+    """Measure the frame rate of the camera preview.
+
+    The frames are pushed line by line through ``draw_image_line`` as fast as
+    possible, as the tracker does during the camera setup.
+
+    Parameters
+    ----------
+    genv : EyeLinkCoreGraphicsPsychoPy
+        The graphics environment.
+    size : tuple of int
+        Size ``(width, height)`` of the camera image.
+    n_frames : int
+        Number of frames pushed.
+
+    Returns
+    -------
+    results : dict
+        The rate of frames received ``received_fps`` and rendered ``fps``, and the
+        number of frames dropped by the graphics environment ``dropped``.
+    """
+    width, height = size
+    frames = [
+        [line.tobytes() for line in frame]
+        for frame in camera_frames(width, height, n_frames, np.random.default_rng(0))
+    ]
+    before = genv.getCameraFrameStats()
+    genv.setup_image_display(width, height)
+    # called by the pylink core before it sends the camera lines
+    genv.__updateimgsize__(width, height)
+    genv.set_image_palette(*camera_palette())
+    start = perf_counter()
+    for frame in frames:
+        for k, line in enumerate(frame, start=1):
+            genv.draw_image_line(width, k, height, line)
+    duration = perf_counter() - start
+    genv.exit_image_display()
+    after = genv.getCameraFrameStats()
+    return dict(
+        received_fps=n_frames / duration,
+        fps=(after["rendered"] - before["rendered"]) / duration,
+        dropped=after["dropped"] - before["dropped"],
+    )
+
+
+def bench_message(eye_link: Eyelink, n_messages: int = 200) -> dict[str, float]:
+    """Measure the time to send a message to the tracker.
+
+    Parameters
+    ----------
+    eye_link : Eyelink
+        The session on the simulated tracker.
+    n_messages : int
+        Number of messages sent synchronously, then queued 1 ms apart.
+
+    Returns
+    -------
+    results : dict
+        The median ``rtt_p50_ms``, 99th percentile ``rtt_p99_ms`` and maximum
+        ``rtt_max_ms`` duration of a synchronous :meth:`~Eyelink.signal`, and the
+        median ``queued_p50_ms`` and 99th percentile ``queued_p99_ms`` latency of a
+        queued signal, in milliseconds.
+    """
+    durations = np.empty(n_messages)
+    for k in range(n_messages):
+        start = perf_counter()
+        eye_link.signal("BENCH")
+        durations[k] = perf_counter() - start
+    durations *= 1e3
+    for _ in range(n_messages):
+        eye_link.signal("BENCH", queued=True)
+        sleep(0.001)
+    while eye_link.signal_stats().get("latency", dict(n=0))["n"] < n_messages:
+        sleep(0.01)
+    latency = eye_link.signal_stats()["latency"]
+    return dict(
+        rtt_p50_ms=float(np.median(durations)),
+        rtt_p99_ms=float(np.percentile(durations, 99)),
+        rtt_max_ms=float(durations.max()),
+        queued_p50_ms=latency["p50"],
+        queued_p99_ms=latency["p99"],
+    )
+
+
+def bench_drain(duration: float = 1.0, sampling_rate: int = 2000) -> dict[str, float]:
+    """Measure the rate at which the link reader drains buffered samples.
+
+    Parameters
+    ----------
+    duration : float
+        Duration in seconds of the recording buffered by the link before the
+        reader starts.
+    sampling_rate : int
+        Sampling rate of the simulated tracker in Hz.
+
+    Returns
+    -------
+    results : dict
+        The number of samples drained ``n_samples`` and the drain rate
+        ``samples_per_second``.
+    """
+    tracker = fill_link(duration, sampling_rate)
+    n_samples = tracker.n_buffered_samples()
+    elapsed = drain_link(tracker, n_samples)
+    return dict(n_samples=n_samples, samples_per_second=n_samples / elapsed)
+
+
+def fill_link(duration: float, sampling_rate: int = 2000) -> SimulatedEyeLink:
+    """Record with a simulated tracker without reading the link.
+
+    Parameters
+    ----------
+    duration : float
+        Duration of the recording in seconds.
+    sampling_rate : int
+        Sampling rate of the simulated tracker in Hz.
+
+    Returns
+    -------
+    tracker : SimulatedEyeLink
+        The simulated tracker, stopped, with the samples and events of the
+        recording buffered in the link.
+    """
+    tracker = SimulatedEyeLink(sampling_rate=sampling_rate, seed=0)
+    tracker.startRecording(1, 1, 1, 1)
+    sleep(duration)
+    tracker.stopRecording()  # generates the samples due, nothing after
+    return tracker
+
+
+def drain_link(tracker: SimulatedEyeLink, n_samples: int) -> float:
+    """Drain the link of a tracker filled by :func:`fill_link`.
+
+    Parameters
+    ----------
+    tracker : SimulatedEyeLink
+        The simulated tracker.
+    n_samples : int
+        Number of samples buffered in the link.
+
+    Returns
+    -------
+    duration : float
+        Time in seconds for the link reader thread to store the samples.
+    """
+    reader = LinkReader(tracker, Lock(), n_samples, [])
+    start = perf_counter()
+    reader.start()
+    while reader.samples.count < n_samples:
+        sleep(0.0001)
+        if not reader.is_alive():
+            logger.warning("The link reader thread ended before draining the link.")
+            break
+    duration = perf_counter() - start
+    reader.stop()
+    return duration
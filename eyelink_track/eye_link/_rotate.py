@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class BlockRotation(Thread):
+    """Thread calling the rotation of the EDF file at a fixed interval.
+
+    Parameters
+    ----------
+    duration : float
+        Duration of a block in seconds.
+    rotate : callable
+        Function closing the current EDF file and opening the next one.
+    """
+
+    def __init__(self, duration: float, rotate: Callable[[], None]) -> None:
+        super().__init__(name="eyelink-edf-rotation", daemon=True)
+        self._duration = duration
+        self._rotate = rotate
+        self._stop_event = Event()
+        self._error = None
+
+    def run(self) -> None:
+        """Rotate the EDF file every block until stopped or until a rotation fails."""
+        while not self._stop_event.wait(self._duration):
+            try:
+                self._rotate()
+            except Exception as error:
+                logger.exception("The rotation of the EDF file failed.")
+                self._error = error
+                return
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the thread, waiting for an ongoing rotation.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time in seconds to wait for the thread to end.
+        """
+        self._stop_event.set()
+        self.join(timeout)
+        if self.is_alive():
+            logger.warning("The EDF rotation thread did not stop within %s s.", timeout)
+
+    @property
+    def stopped(self) -> bool:
+        """True once the thread is requested to stop."""
+        return self._stop_event.is_set()
+
+    @property
+    def error(self) -> Exception | None:
+        """Exception raised by the failed rotation, if any."""
+        return self._error
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from queue import SimpleQueue
+from threading import Thread
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from ..utils._timing import StageTimer
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from threading import Lock
+
+    import pylink
+
+
+class SignalSender(Thread):
+    """Thread sending the queued messages to the tracker.
+
+    Each message is stamped with :func:`time.perf_counter` when queued and sent
+    with the EyeLink ``offset`` syntax, ``'<offset> <message>'``, for which the Host
+    PC timestamps the message ``offset`` milliseconds before its reception.
+
+    Parameters
+    ----------
+    tracker : EyeLink
+        Connection to the tracker.
+    lock : Lock
+        Lock serializing the calls to the tracker connection.
+    """
+
+    def __init__(self, tracker: pylink.EyeLink, lock: Lock) -> None:
+        super().__init__(name="eyelink-signal-sender", daemon=True)
+        self._tracker = tracker
+        self._lock = lock
+        self._queue = SimpleQueue()
+        # 'send' is the duration of sendMessage(), 'latency' the time between the
+        # call to put() and the end of sendMessage()
+        self._timer = StageTimer(("send", "latency"))
+        self._failed = 0
+
+    def put(self, value: str) -> None:
+        """Queue a message, timestamped now.
+
+        Parameters
+        ----------
+        value : str
+            The message.
+        """
+        self._queue.put((perf_counter(), value))
+
+    def run(self) -> None:
+        """Send the queued messages until the sentinel None is received."""
+        while (item := self._queue.get()) is not None:
+            stamp, value = item
+            try:
+                with self._lock:
+                    start = perf_counter()
+                    # the offset is rounded down, the Host PC works in milliseconds
+                    offset = int((start - stamp) * 1000)
+                    self._tracker.sendMessage(f"{offset} {value}")
+            except Exception:
+                # the next messages are still sent
+                self._failed += 1
+                logger.exception("The message '%s' could not be sent.", value)
+                continue
+            self._timer.record_since("send", start)
+            self._timer.record_since("latency", stamp)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Send the queued messages and stop the thread.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time in seconds to wait for the queued messages to be sent.
+        """
+        self._queue.put(None)
+        self.join(timeout)
+        if self.is_alive():
+            logger.warning(
+                "The signal sender thread did not stop within %s s, %i messages are "
+                "still queued.",
+                timeout,
+                self._queue.qsize(),
+            )
+
+    def stats(self) -> dict:
+        """Metrics of the sent messages.
+
+        Returns
+        -------
+        stats : dict
+            Dictionary with the number of messages still queued ``queue_depth``,
+            the number of messages which could not be sent ``failed`` and the
+            summary of the durations ``send`` and ``latency`` (see
+            :meth:`~eyelink_track.utils._timing.StageTimer.summary`).
+        """
+        stats = dict(queue_depth=self._queue.qsize(), failed=self._failed)
+        stats.update(self._timer.summary())
+        return stats
@@ -0,0 +1,493 @@
+from __future__ import annotations
+
+from collections import deque
+from math import hypot
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pylink
+
+from ..utils._checks import check_type, check_value, ensure_int
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from .EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+
+# gaze model of the simulated participant, in pixels and milliseconds
+_SCREEN = (1920, 1080)
+_PPD = 35.0  # pixels per degree
+_FIXATION_DURATION = (150.0, 400.0)
+_BLINK_DURATION = (80.0, 150.0)
+_BLINK_PROBABILITY = 0.1
+_MISSING = pylink.MISSING_DATA
+
+
+class _EyeData:
+    """Gaze and pupil of one eye in a simulated sample."""
+
+    __slots__ = ("_gaze", "_pupil")
+
+    def __init__(self, gaze: tuple[float, float], pupil: float) -> None:
+        self._gaze = gaze
+        self._pupil = pupil
+
+    def getGaze(self) -> tuple[float, float]:
+        return self._gaze
+
+    def getPupilSize(self) -> float:
+        return self._pupil
+
+
+class _Sample:
+    """Simulated sample, with the getters of :class:`pylink.Sample`."""
+
+    __slots__ = ("_time", "_left", "_right")
+
+    def __init__(
+        self, time: float, left: _EyeData | None, right: _EyeData | None
+    ) -> None:
+        self._time = time
+        self._left = left
+        self._right = right
+
+    def getTime(self) -> float:
+        return self._time
+
+    def isLeftSample(self) -> bool:
+        return self._left is not None
+
+    def isRightSample(self) -> bool:
+        return self._right is not None
+
+    def getLeftEye(self) -> _EyeData | None:
+        return self._left
+
+    def getRightEye(self) -> _EyeData | None:
+        return self._right
+
+    def getTargetX(self) -> int:
+        return _MISSING
+
+    def getTargetY(self) -> int:
+        return _MISSING
+
+    def getTargetDistance(self) -> int:
+        return _MISSING
+
+    def getStatus(self) -> int:
+        return 0
+
+
+class _Event:
+    """Simulated eye event, with the getters of the pylink events."""
+
+    __slots__ = ("_eye", "_start", "_end", "_start_gaze", "_end_gaze", "_pupil")
+
+    def __init__(
+        self,
+        eye: int,
+        start: float,
+        end: float = 0.0,
+        start_gaze: tuple[float, float] = (_MISSING, _MISSING),
+        end_gaze: tuple[float, float] = (_MISSING, _MISSING),
+        pupil: float = _MISSING,
+    ) -> None:
+        self._eye = eye
+        self._start = start
+        self._end = end
+        self._start_gaze = start_gaze
+        self._end_gaze = end_gaze
+        self._pupil = pupil
+
+    def getEye(self) -> int:
+        return self._eye
+
+    def getStartTime(self) -> float:
+        return self._start
+
+    def getEndTime(self) -> float:
+        return self._end
+
+    def getStartGaze(self) -> tuple[float, float]:
+        return self._start_gaze
+
+    def getEndGaze(self) -> tuple[float, float]:
+        return self._end_gaze
+
+    def getAveragePupilSize(self) -> float:
+        return self._pupil
+
+    def getAmplitude(self) -> tuple[float, float]:
+        return (
+            abs(self._end_gaze[0] - self._start_gaze[0]) / _PPD,
+            abs(self._end_gaze[1] - self._start_gaze[1]) / _PPD,
+        )
+
+
+class SimulatedEyeLink:
+    """Simulated EyeLink tracker.
+
+    Implements the subset of the :class:`pylink.EyeLink` API used by
+    :class:`~eyelink_track.eye_link.Eyelink` and by the calibration graphics
+    environment. Samples and fixation, saccade and blink events of a simulated
+    participant are generated in real-time during the recordings, sent over the
+    simulated link and written, as text, to the data file downloaded by
+    :meth:`receiveDataFile`. :meth:`doTrackerSetup` streams camera frames
+    through ``draw_image_line`` and presents the calibration targets.
+
+    Parameters
+    ----------
+    sampling_rate : int
+        Sampling rate in Hz, between 250 and 2000 Hz.
+    eye : str
+        Recorded eye, one of ``'left'``, ``'right'`` or ``'binocular'``.
+    camera_size : tuple of int
+        Size ``(width, height)`` of the simulated camera image.
+    n_camera_frames : int
+        Number of camera frames streamed by :meth:`doTrackerSetup`.
+    seed : int | None
+        Seed of the random generator of the simulated participant.
+    """
+
+    def __init__(
+        self,
+        sampling_rate: int = 1000,
+        eye: str = "binocular",
+        camera_size: tuple[int, int] = (192, 160),
+        n_camera_frames: int = 60,
+        seed: int | None = None,
+    ) -> None:
+        sampling_rate = ensure_int(sampling_rate, "sampling_rate")
+        if not 250 <= sampling_rate <= 2000:
+            raise ValueError(
+                "The sampling rate must be between 250 and 2000 Hz. Got "
+                f"{sampling_rate} Hz."
+            )
+        check_value(eye, ("left", "right", "binocular"), "eye")
+        check_type(camera_size, (tuple,), "camera_size")
+        self._camera_size = tuple(ensure_int(elt, "camera_size") for elt in camera_size)
+        self._n_camera_frames = ensure_int(n_camera_frames, "n_camera_frames")
+        self._interval = 1000 / sampling_rate
+        self._eyes = dict(left=(0,), right=(1,), binocular=(0, 1))[eye]
+        self._rng = np.random.default_rng(seed)
+        self._clock_start = perf_counter()
+        self._connected = True
+        self._mode = pylink.IN_IDLE_MODE
+        self._genv = None
+        self._reply = None
+        self.commands = []
+        # data files on the simulated Host PC
+        self._files = dict()
+        self._file = None
+        # recording state
+        self._recording = False
+        self._link_samples = False
+        self._link_events = False
+        self._link = deque(maxlen=4 * sampling_rate)  # 4 seconds of samples
+        self._data = None
+        self._next_sample = 0.0
+        self._gaze = (_SCREEN[0] / 2, _SCREEN[1] / 2)
+        self._pupil = 1000.0
+        self._phase = None
+
+    def getTrackerVersionString(self) -> str:
+        return "EYELINK SIMULATED 5.50"
+
+    def isConnected(self) -> bool:
+        return self._connected
+
+    def close(self) -> None:
+        self._connected = False
+
+    def setOfflineMode(self) -> None:
+        self._mode = pylink.IN_IDLE_MODE
+
+    def getCurrentMode(self) -> int:
+        return self._mode
+
+    def sendCommand(self, command: str) -> None:
+        self.commands.append(command)
+
+    def readRequest(self, variable: str) -> None:
+        # e.g. 'aux_mouse_simulation', the simulated tracker does not use a mouse
+        self._reply = "0"
+
+    def readReply(self) -> str | None:
+        reply, self._reply = self._reply, None
+        return reply
+
+    def trackerTime(self) -> int:
+        return int(self._now())
+
+    def trackerTimeUsec(self) -> float:
+        return self._now() * 1000
+
+    def _now(self) -> float:
+        """Tracker time in milliseconds."""
+        return (perf_counter() - self._clock_start) * 1000
+
+    # -- data files ---------------------------------------------------------------
+    def openDataFile(self, fname: str) -> None:
+        self._file = fname
+        self._files[fname] = [f"** SIMULATED DATA FILE {fname}\n"]
+
+    def closeDataFile(self) -> None:
+        self._file = None
+
+    def sendMessage(self, text: str) -> None:
+        """Write a message in the data file, supporting the ``'<offset> '`` prefix."""
+        now = self._now()
+        offset, _, message = text.partition(" ")
+        if offset.isdigit() and message:
+            now -= int(offset)
+        else:
+            message = text
+        self._write(f"MSG\t{now:.1f} {message}\n")
+
+    def receiveDataFile(self, src: str, dest: str) -> int:
+        """Write the simulated data file to ``dest`` and return its size."""
+        if src not in self._files:
+            raise RuntimeError(f"The file '{src}' does not exist on the Host PC.")
+        content = "".join(self._files[src]).encode()
+        with open(dest, "wb") as fid:
+            for start in range(0, len(content), 65536):
+                chunk = content[start : start + 65536]
+                fid.write(chunk)
+                self.progressUpdate(src, len(content), start + len(chunk))
+        return len(content)
+
+    def progressUpdate(self, fname: str, size: int, received: int) -> int:
+        """Report the transfer progress, overwritten as in pylink."""
+        return 0
+
+    def _write(self, line: str) -> None:
+        if self._file is not None:
+            self._files[self._file].append(line)
+
+    def startRecording(
+        self, file_samples: int, file_events: int, link_samples: int, link_events: int
+    ) -> None:
+        self._mode = pylink.IN_RECORD_MODE
+        self._recording = True
+        self._link_samples = bool(link_samples)
+        self._link_events = bool(link_events)
+        self._link.clear()
+        self._data = None
+        self._next_sample = self._now()
+        self._start_fixation(self._next_sample)
+
+    def stopRecording(self) -> None:
+        if self._recording:
+            self._advance(self._now())
+        self._recording = False
+        self._mode = pylink.IN_IDLE_MODE
+
+    def getNextData(self) -> int:
+        """Fetch the next item of the link queue, generating the due samples."""
+        if self._recording:
+            self._advance(self._now())
+        if not self._link:
+            self._data = None
+            return 0
+        data_type, self._data = self._link.popleft()
+        return data_type
+
+    def getFloatData(self) -> _Sample | _Event | None:
+        return self._data
+
+    def n_buffered_samples(self) -> int:
+        """Return the number of samples waiting in the link queue."""
+        return sum(data_type == pylink.SAMPLE_TYPE for data_type, _ in self._link)
+
+    def _advance(self, now: float) -> None:
+        """Generate the samples and events up to the tracker time ``now``."""
+        while self._next_sample <= now:
+            time = self._next_sample
+            self._next_sample += self._interval
+            self._step(time)
+
+    def _step(self, time: float) -> None:
+        """Generate the sample at ``time`` and the events ending at ``time``."""
+        kind, start, end, origin, target = self._phase
+        if end <= time:
+            self._end_phase(time)
+            kind, start, end, origin, target = self._phase
+        if kind == "saccade":
+            alpha = (time - start) / (end - start)
+            gaze = (
+                origin[0] + alpha * (target[0] - origin[0]),
+                origin[1] + alpha * (target[1] - origin[1]),
+            )
+        elif kind == "fixation":
+            gaze = tuple(target + self._rng.normal(0, 0.3, size=2))
+        else:  # blink
+            gaze = None
+        if gaze is None:
+            eye_data = _EyeData((_MISSING, _MISSING), 0.0)
+        else:
+            self._gaze = gaze
+            eye_data = _EyeData(gaze, self._pupil + self._rng.normal(0, 5))
+        sample = _Sample(
+            time,
+            eye_data if 0 in self._eyes else None,
+            eye_data if 1 in self._eyes else None,
+        )
+        x, y = eye_data.getGaze()
+        self._write(f"{time:.1f}\t{x:.1f}\t{y:.1f}\t{eye_data.getPupilSize():.1f}\n")
+        if self._link_samples:
+            self._link.append((pylink.SAMPLE_TYPE, sample))
+
+    def _emit(self, data_type: int, **kwargs) -> None:
+        """Emit an event for each recorded eye."""
+        for eye in self._eyes:
+            event = _Event(eye, **kwargs)
+            if data_type in (pylink.ENDFIX, pylink.ENDSACC, pylink.ENDBLINK):
+                code = {
+                    pylink.ENDFIX: "EFIX",
+                    pylink.ENDSACC: "ESACC",
+                    pylink.ENDBLINK: "EBLINK",
+                }[data_type]
+                self._write(
+                    f"{code} {'LR'[eye]}\t{event.getStartTime():.1f}\t"
+                    f"{event.getEndTime():.1f}\n"
+                )
+            if self._link_events:
+                self._link.append((data_type, event))
+
+    def _start_fixation(self, time: float) -> None:
+        duration = self._rng.uniform(*_FIXATION_DURATION)
+        target = np.array(self._gaze)
+        self._phase = ("fixation", time, time + duration, self._gaze, target)
+        self._emit(pylink.STARTFIX, start=time)
+
+    def _end_phase(self, time: float) -> None:
+        """End the current phase and start the next one."""
+        kind, start, end, origin, target = self._phase
+        if kind == "fixation":
+            gaze = tuple(target)
+            self._emit(
+                pylink.ENDFIX,
+                start=start,
+                end=end,
+                start_gaze=gaze,
+                end_gaze=gaze,
+                pupil=self._pupil,
+            )
+            if self._rng.random() < _BLINK_PROBABILITY:
+                duration = self._rng.uniform(*_BLINK_DURATION)
+                self._phase = ("blink", end, end + duration, gaze, gaze)
+                self._emit(pylink.STARTBLINK, start=end)
+                return
+            target = (
+                self._rng.uniform(0.1, 0.9) * _SCREEN[0],
+                self._rng.uniform(0.1, 0.9) * _SCREEN[1],
+            )
+            # main sequence, ~2 ms per degree on top of 20 ms
+            amplitude = hypot(target[0] - gaze[0], target[1] - gaze[1]) / _PPD
+            duration = 20 + 2.2 * amplitude
+            self._phase = ("saccade", end, end + duration, gaze, target)
+            self._emit(pylink.STARTSACC, start=end)
+        elif kind == "saccade":
+            self._gaze = target
+            self._emit(
+                pylink.ENDSACC,
+                start=start,
+                end=end,
+                start_gaze=origin,
+                end_gaze=target,
+                pupil=self._pupil,
+            )
+            self._start_fixation(end)
+        else:  # blink
+            self._emit(pylink.ENDBLINK, start=start, end=end)
+            self._start_fixation(end)
+
+    def openGraphicsEx(self, genv: EyeLinkCoreGraphicsPsychoPy) -> None:
+        """Attach the graphics environment driven by :meth:`doTrackerSetup`."""
+        self._genv = genv
+
+    def doTrackerSetup(self) -> None:
+        """Stream the camera frames and present the calibration targets."""
+        if self._genv is None:
+            logger.warning("No graphics environment attached to the simulated tracker.")
+            return
+        self._mode = pylink.IN_SETUP_MODE
+        try:
+            self._genv.setup_cal_display()
+            self.stream_camera(self._genv, self._n_camera_frames)
+            for x, y in _calibration_targets():
+                self._genv.draw_cal_target(x, y)
+                self._genv.erase_cal_target()
+            self._genv.exit_cal_display()
+        finally:
+            self._mode = pylink.IN_IDLE_MODE
+
+    def exitCalibration(self) -> None:
+        self._mode = pylink.IN_IDLE_MODE
+
+    def stream_camera(self, genv: EyeLinkCoreGraphicsPsychoPy, n_frames: int) -> None:
+        """Push camera frames line by line through ``draw_image_line``.
+
+        Parameters
+        ----------
+        genv : EyeLinkCoreGraphicsPsychoPy
+            The graphics environment.
+        n_frames : int
+            Number of frames.
+        """
+        width, height = self._camera_size
+        genv.setup_image_display(width, height)
+        # called by the pylink core before it sends the camera lines
+        genv.__updateimgsize__(width, height)
+        genv.image_title("Simulated camera")
+        genv.set_image_palette(*camera_palette())
+        for frame in camera_frames(width, height, n_frames, self._rng):
+            for line in range(height):
+                genv.draw_image_line(width, line + 1, height, frame[line].tobytes())
+        genv.exit_image_display()
+
+
+def camera_palette() -> tuple[list[int], list[int], list[int]]:
+    """Palette of the simulated camera images, a grayscale ramp."""
+    ramp = list(range(0, 256, 4))
+    return ramp, ramp, ramp
+
+
+def camera_frames(
+    width: int, height: int, n_frames: int, rng: np.random.Generator | None = None
+) -> np.ndarray:
+    """Generate simulated camera frames of palette indices.
+
+    A dark pupil moves on a noisy gray background.
+
+    Parameters
+    ----------
+    width : int
+        Width of a frame.
+    height : int
+        Height of a frame.
+    n_frames : int
+        Number of frames.
+    rng : Generator | None
+        The random generator.
+
+    Returns
+    -------
+    frames : array of shape (n_frames, height, width)
+        The frames, as uint8 indices in :func:`camera_palette`.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    frames = rng.integers(24, 40, size=(n_frames, height, width), dtype=np.uint8)
+    yy, xx = np.mgrid[:height, :width]
+    for k, frame in enumerate(frames):
+        cx = width / 2 + width / 6 * np.cos(2 * np.pi * k / max(n_frames, 1))
+        frame[(xx - cx) ** 2 + (yy - height / 2) ** 2 < (height / 8) ** 2] = 2
+    return frames
+
+
+def _calibration_targets() -> list[tuple[int, int]]:
+    """Position of the 9 calibration targets, in pixels from the top-left corner."""
+    xs = (_SCREEN[0] * 0.1, _SCREEN[0] / 2, _SCREEN[0] * 0.9)
+    ys = (_SCREEN[1] * 0.1, _SCREEN[1] / 2, _SCREEN[1] * 0.9)
+    return [(int(x), int(y)) for y in ys for x in xs]
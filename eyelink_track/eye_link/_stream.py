@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from collections import deque
+from math import hypot, nan
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pylink
+
+from ..utils._buffer import RingBuffer
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from threading import Lock
+
+#: Data type of the link samples, the fields of an eye not recorded and the missing
+#: values, e.g. the gaze during a blink, are NaN.
+SAMPLE_DTYPE = np.dtype(
+    [
+        ("time", np.float64),  # tracker time in ms
+        ("left_gaze_x", np.float32),
+        ("left_gaze_y", np.float32),
+        ("left_pupil", np.float32),
+        ("right_gaze_x", np.float32),
+        ("right_gaze_y", np.float32),
+        ("right_pupil", np.float32),
+        ("target_x", np.float32),
+        ("target_y", np.float32),
+        ("target_distance", np.float32),
+        ("status", np.uint16),
+    ]
+)
+_NO_EYE = (np.nan, np.nan, np.nan)
+_EVENT_TYPES = {
+    pylink.STARTFIX: "start_fixation",
+    pylink.ENDFIX: "end_fixation",
+    pylink.FIXUPDATE: "fixation_update",
+    pylink.STARTSACC: "start_saccade",
+    pylink.ENDSACC: "end_saccade",
+    pylink.STARTBLINK: "start_blink",
+    pylink.ENDBLINK: "end_blink",
+}
+# events carrying summary data, the start events only carry the start time
+_SUMMARY_EVENTS = (pylink.ENDFIX, pylink.FIXUPDATE, pylink.ENDSACC)
+
+
+class LinkEvent:
+    """Fixation, saccade or blink event received over the link.
+
+    The fields not carried by the event type are NaN, e.g. the start events only
+    carry the start time.
+
+    Attributes
+    ----------
+    type : str
+        Type of event, one of ``'start_fixation'``, ``'end_fixation'``,
+        ``'fixation_update'``, ``'start_saccade'``, ``'end_saccade'``,
+        ``'start_blink'`` and ``'end_blink'``.
+    eye : int
+        Eye of the event, ``0`` for the left eye and ``1`` for the right eye.
+    start : float
+        Start time of the event, in tracker time (ms).
+    end : float
+        End time of the event, in tracker time (ms).
+    start_x, start_y : float
+        Gaze position at the start of the event.
+    end_x, end_y : float
+        Gaze position at the end of the event.
+    amplitude : float
+        Amplitude of the saccade in degrees.
+    pupil : float
+        Average pupil size during the fixation or the saccade.
+    """
+
+    __slots__ = (
+        "type",
+        "eye",
+        "start",
+        "end",
+        "start_x",
+        "start_y",
+        "end_x",
+        "end_y",
+        "amplitude",
+        "pupil",
+    )
+
+    def __init__(
+        self,
+        type: str,  # noqa: A002
+        eye: int,
+        start: float,
+        end: float = nan,
+        start_x: float = nan,
+        start_y: float = nan,
+        end_x: float = nan,
+        end_y: float = nan,
+        amplitude: float = nan,
+        pupil: float = nan,
+    ) -> None:
+        self.type = type
+        self.eye = eye
+        self.start = start
+        self.end = end
+        self.start_x = start_x
+        self.start_y = start_y
+        self.end_x = end_x
+        self.end_y = end_y
+        self.amplitude = amplitude
+        self.pupil = pupil
+
+    def __repr__(self) -> str:
+        """Representation of the event."""
+        if self.end != self.end:  # NaN, start event
+            return f"<LinkEvent '{self.type}' | eye {self.eye} at {self.start} ms>"
+        return (
+            f"<LinkEvent '{self.type}' | eye {self.eye} from {self.start} to "
+            f"{self.end} ms>"
+        )
+
+
+class LinkReader(Thread):
+    """Thread draining the link data of a recording tracker.
+
+    Parameters
+    ----------
+    tracker : EyeLink
+        Connection to the tracker, recording with link samples enabled.
+    lock : Lock
+        Lock serializing the calls to the tracker connection.
+    capacity : int
+        Number of samples kept in the ring buffer.
+    callbacks : list of callable
+        Functions called from the thread with each :class:`LinkEvent` received. The
+        list can be modified while the thread runs.
+    event_capacity : int
+        Number of events kept until pulled with :meth:`get_events`.
+    """
+
+    def __init__(
+        self,
+        tracker: pylink.EyeLink,
+        lock: Lock,
+        capacity: int,
+        callbacks: list[Callable[[LinkEvent], None]],
+        event_capacity: int = 10000,
+    ) -> None:
+        super().__init__(name="eyelink-link-reader", daemon=True)
+        self._tracker = tracker
+        self._lock = lock
+        self._stop_event = Event()
+        self._callbacks = callbacks
+        self.samples = RingBuffer(SAMPLE_DTYPE, capacity)
+        self._events = deque(maxlen=event_capacity)
+
+    def run(self) -> None:
+        """Drain the link queue until stopped."""
+        while not self._stop_event.is_set():
+            with self._lock:
+                data_type = self._tracker.getNextData()
+                data = self._tracker.getFloatData() if data_type != 0 else None
+            if data_type == 0:
+                # the link queue is empty, it buffers the samples while idle
+                self._stop_event.wait(0.001)
+            elif data is None:
+                continue
+            elif data_type == pylink.SAMPLE_TYPE:
+                self.samples.append(_sample_record(data))
+            elif data_type in _EVENT_TYPES:
+                self._dispatch(_link_event(data_type, data))
+
+    def _dispatch(self, event: LinkEvent) -> None:
+        """Store an event and forward it to the callbacks."""
+        self._events.append(event)
+        for callback in tuple(self._callbacks):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("The event callback %s failed.", callback)
+
+    def get_events(self) -> list[LinkEvent]:
+        """Pull the events received since the previous call.
+
+        Returns
+        -------
+        events : list of LinkEvent
+            The events, oldest to newest.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.popleft())
+            except IndexError:
+                return events
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Stop the thread.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time in seconds to wait for the thread to end.
+        """
+        self._stop_event.set()
+        self.join(timeout)
+        if self.is_alive():
+            logger.warning("The link reader thread did not stop within %s s.", timeout)
+
+
+def _sample_record(sample: pylink.Sample) -> tuple:
+    """Convert a pylink sample into a record of SAMPLE_DTYPE."""
+    if sample.isLeftSample():
+        eye = sample.getLeftEye()
+        left = (
+            *map(_nan_if_missing, eye.getGaze()),
+            _nan_if_missing(eye.getPupilSize()),
+        )
+    else:
+        left = _NO_EYE
+    if sample.isRightSample():
+        eye = sample.getRightEye()
+        right = (
+            *map(_nan_if_missing, eye.getGaze()),
+            _nan_if_missing(eye.getPupilSize()),
+        )
+    else:
+        right = _NO_EYE
+    return (
+        sample.getTime(),
+        *left,
+        *right,
+        _nan_if_missing(sample.getTargetX()),
+        _nan_if_missing(sample.getTargetY()),
+        _nan_if_missing(sample.getTargetDistance()),
+        sample.getStatus(),
+    )
+
+
+def _nan_if_missing(value: float) -> float:
+    """Replace the pylink marker of a missing value with NaN."""
+    return nan if value == pylink.MISSING_DATA else value
+
+
+def _link_event(data_type: int, event) -> LinkEvent:
+    """Convert a pylink event into a LinkEvent."""
+    if data_type not in _SUMMARY_EVENTS:
+        if data_type == pylink.ENDBLINK:
+            return LinkEvent(
+                _EVENT_TYPES[data_type],
+                event.getEye(),
+                event.getStartTime(),
+                event.getEndTime(),
+            )
+        return LinkEvent(_EVENT_TYPES[data_type], event.getEye(), event.getStartTime())
+    start_x, start_y = event.getStartGaze()
+    end_x, end_y = event.getEndGaze()
+    return LinkEvent(
+        _EVENT_TYPES[data_type],
+        event.getEye(),
+        event.getStartTime(),
+        event.getEndTime(),
+        start_x,
+        start_y,
+        end_x,
+        end_y,
+        hypot(*event.getAmplitude()) if data_type == pylink.ENDSACC else nan,
+        event.getAveragePupilSize(),
+    )
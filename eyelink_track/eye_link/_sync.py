@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from threading import Event, Thread
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from ..utils._clock import ClockModel
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from threading import Lock
+
+    import pylink
+
+
+class ClockSync(Thread):
+    """Thread sampling the tracker clock against the local clock.
+
+    Every ``interval`` seconds, the tracker time is read ``n_reads`` times and the
+    read with the shortest round-trip is kept, timestamped locally at the middle
+    of the round-trip with :func:`time.perf_counter`.
+
+    Parameters
+    ----------
+    tracker : EyeLink
+        Connection to the tracker.
+    lock : Lock
+        Lock serializing the calls to the tracker connection.
+    interval : float
+        Time between two samples in seconds.
+    n_reads : int
+        Number of reads of the tracker time per sample.
+    """
+
+    def __init__(
+        self,
+        tracker: pylink.EyeLink,
+        lock: Lock,
+        interval: float = 1.0,
+        n_reads: int = 5,
+    ) -> None:
+        super().__init__(name="eyelink-clock-sync", daemon=True)
+        self._tracker = tracker
+        self._lock = lock
+        self._interval = interval
+        self._n_reads = n_reads
+        self._stop_event = Event()
+        self._local = []
+        self._tracker_times = []
+        self._round_trips = []
+
+    def run(self) -> None:
+        """Sample the clocks until stopped."""
+        while True:
+            self.sample()
+            if self._stop_event.wait(self._interval):
+                return
+
+    def sample(self) -> None:
+        """Sample the tracker clock against the local clock."""
+        best = None
+        for _ in range(self._n_reads):
+            with self._lock:
+                start = perf_counter()
+                tracker_time = self._tracker.trackerTimeUsec() / 1000
+                stop = perf_counter()
+            if best is None or stop - start < best[2]:
+                best = ((start + stop) / 2, tracker_time, stop - start)
+        self._local.append(best[0])
+        self._tracker_times.append(best[1])
+        self._round_trips.append(best[2])
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Take a last sample and stop the thread.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time in seconds to wait for the thread to end.
+        """
+        self._stop_event.set()
+        self.join(timeout)
+        if self.is_alive():
+            logger.warning("The clock sync thread did not stop within %s s.", timeout)
+        else:
+            self.sample()
+
+    def fit(self) -> ClockModel:
+        """Fit the clock model on the samples collected so far.
+
+        Returns
+        -------
+        model : ClockModel
+            The offset and drift model.
+        """
+        return ClockModel.fit(self._local, self._tracker_times)
+
+    def samples(self) -> dict[str, list[float]]:
+        """Return the samples collected so far.
+
+        Returns
+        -------
+        samples : dict
+            Dictionary with the local timestamps ``local`` in seconds, the tracker
+            timestamps ``tracker`` in milliseconds and the round-trip durations
+            ``round_trip`` in seconds.
+        """
+        return dict(
+            local=list(self._local),
+            tracker=list(self._tracker_times),
+            round_trip=list(self._round_trips),
+        )
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import array
+import string
+
+import numpy as np
+import pylink
+import pytest
+
+from .._simulated import SimulatedEyeLink, camera_frames, camera_palette
+
+pytest.importorskip("psychopy.visual")
+
+
+@pytest.fixture(scope="module")
+def win():
+    """Create a small PsychoPy window."""
+    from psychopy.visual import Window
+
+    win = Window(
+        size=(800, 600),
+        units="pix",
+        fullscr=False,
+        winType="pyglet",
+        checkTiming=False,
+    )
+    yield win
+    win.close()
+
+
+@pytest.fixture
+def genv(win):
+    """Create a graphics environment drawing in the window."""
+    from ..EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+
+    return EyeLinkCoreGraphicsPsychoPy(SimulatedEyeLink(seed=101), win)
+
+
+def test_target_assets(genv, tmp_path):
+    """Test that the target stimuli are prepared before the calibration."""
+    from PIL import Image
+
+    fname = tmp_path / "target.png"
+    Image.new("RGB", (32, 32), (255, 0, 0)).save(fname)
+    genv.setPictureTarget(fname)
+    genv.setTargetType("picture")
+    genv.waitTargetAssets()
+    stim = genv._calibTar
+    assert stim is not None
+    assert len(genv._targetCache) == 1
+    # entering the calibration re-uses the cached stimuli
+    genv.setup_cal_display()
+    assert genv._calibTar is stim
+    assert len(genv._targetCache) == 1
+
+
+def test_target_assets_replaced(genv, tmp_path):
+    """Test that only the current picture target is waited for."""
+    from PIL import Image
+
+    broken = tmp_path / "broken.png"
+    broken.write_text("not a picture")
+    genv.setPictureTarget(broken)
+    # the picture is not the target, its failure does not matter
+    genv.setTargetType("circle")
+    genv.waitTargetAssets()
+    fname = tmp_path / "target.png"
+    Image.new("RGB", (32, 32), (255, 0, 0)).save(fname)
+    genv.setPictureTarget(fname)
+    genv.setTargetType("picture")
+    genv.waitTargetAssets()
+    assert genv._calibTar is not None
+
+
+def _reference_palette(r, g, b):
+    """Pack a palette as the original per-pixel implementation, read as RGBX."""
+    return [(int(b[i]) << 16) | (int(g[i]) << 8) | int(r[i]) for i in range(len(r))]
+
+
+def _reference_key(keycode):
+    """Convert a psychopy key name to a pylink key code as the original mapping."""
+    keys = {
+        "f1": pylink.F1_KEY,
+        "f2": pylink.F2_KEY,
+        "f3": pylink.F3_KEY,
+        "f4": pylink.F4_KEY,
+        "f5": pylink.F5_KEY,
+        "f6": pylink.F6_KEY,
+        "f7": pylink.F7_KEY,
+        "f8": pylink.F8_KEY,
+        "f9": pylink.F9_KEY,
+        "f10": pylink.F10_KEY,
+        "pageup": pylink.PAGE_UP,
+        "pagedown": pylink.PAGE_DOWN,
+        "up": pylink.CURS_UP,
+        "down": pylink.CURS_DOWN,
+        "left": pylink.CURS_LEFT,
+        "right": pylink.CURS_RIGHT,
+        "backspace": ord("\b"),
+        "return": pylink.ENTER_KEY,
+        "space": ord(" "),
+        "escape": 27,
+        "tab": ord("\t"),
+    }
+    if keycode in ("num_add", "equal"):
+        return ord("+")
+    if keycode in ("num_subtract", "minus"):
+        return ord("-")
+    if keycode in keys:
+        return keys[keycode]
+    if len(keycode) == 1 and keycode in string.ascii_letters:
+        return ord(keycode)
+    return 0
+
+
+def _reference_modifier(alt, ctrl, shift):
+    """Convert the key modifiers to a pylink modifier code as the original mapping."""
+    if alt:
+        return 256
+    elif ctrl:
+        return 64
+    elif shift:
+        return 1
+    return 0
+
+
+def test_set_image_palette(genv):
+    """Test the palette lookup table against the original packing."""
+    rng = np.random.default_rng(101)
+    r, g, b = rng.integers(0, 256, size=(3, 64)).tolist()
+    genv.set_image_palette(r, g, b)
+    assert genv._pal.dtype == np.uint32
+    assert genv._pal.tolist() == _reference_palette(r, g, b)
+    # the table of a palette pushed again is cached
+    pal = genv._pal
+    genv.set_image_palette(list(r), list(g), list(b))
+    assert genv._pal is pal
+
+
+@pytest.mark.parametrize("as_bytes", [True, False])
+def test_draw_image_line(genv, as_bytes):
+    """Test the decoded camera frame against the original per-pixel decoding."""
+    width, height = 48, 32
+    rng = np.random.default_rng(101)
+    r, g, b = rng.integers(0, 256, size=(3, 64)).tolist()
+    frame = camera_frames(width, height, 1, rng)[0]
+    genv.setup_image_display(width, height)
+    genv.__updateimgsize__(width, height)
+    genv.set_image_palette(r, g, b)
+    for k, line in enumerate(frame, start=1):
+        genv.draw_image_line(
+            width, k, height, line.tobytes() if as_bytes else line.tolist()
+        )
+    pal = _reference_palette(r, g, b)
+    expected = array.array("I", [pal[index] for index in frame.ravel()]).tobytes()
+    decoded = np.ascontiguousarray(genv._frontbuffer[:height, :width]).tobytes()
+    assert decoded == expected
+    assert genv.getCameraFrameStats()["received"] == 1
+    genv.exit_image_display()
+
+
+def test_key_codes():
+    """Test the key dispatch tables against the original if/elif mapping."""
+    from pyglet.window import key
+
+    from ..EyeLinkCoreGraphicsPsychoPy import _KEY_CODES, _MODIFIER_CODES
+
+    keycodes = [
+        *(f"f{k}" for k in range(1, 13)),
+        *("pageup", "pagedown", "up", "down", "left", "right", "backspace"),
+        *("return", "space", "escape", "tab", "num_add", "equal"),
+        *("num_subtract", "minus", "home", "num_1", "lshift"),
+        *string.ascii_letters,
+    ]
+    for keycode in keycodes:
+        assert _KEY_CODES.get(keycode, 0) == _reference_key(keycode), keycode
+    for alt in (False, True):
+        for ctrl in (False, True):
+            for shift in (False, True):
+                mod = key.MOD_ALT * alt | key.MOD_CTRL * ctrl | key.MOD_SHIFT * shift
+                assert _MODIFIER_CODES[mod & 7] == _reference_modifier(alt, ctrl, shift)
+
+
+def test_flip_budget(genv):
+    """Test that a circle target is drawn and erased with one flip each."""
+    genv.setTargetType("circle")
+    genv.setup_cal_display()
+    for x, y in [(100, 100), (400, 300), (700, 500)]:
+        genv.draw_cal_target(x, y)
+        genv.erase_cal_target()
+    assert genv.getFlipStats() == dict(flips=6, targets=3, flips_per_target=2.0)
+    genv.exit_cal_display()
+
+
+def test_camera_frame_coalescing(genv, monkeypatch):
+    """Test that the frames pushed faster than the display refresh are coalesced."""
+    width, height = 48, 32
+    frames = camera_frames(width, height, 5, np.random.default_rng(101))
+    genv.setCameraFrameCoalescing(True)
+    genv.setup_image_display(width, height)
+    genv.__updateimgsize__(width, height)
+    genv.set_image_palette(*camera_palette())
+    # the frames are pushed faster than the display refresh
+    monkeypatch.setattr(genv._display, "monitorFramePeriod", 10.0)
+    for frame in frames:
+        for k, line in enumerate(frame, start=1):
+            genv.draw_image_line(width, k, height, line.tobytes())
+    stats = genv.getCameraFrameStats()
+    assert stats == dict(received=5, rendered=1, dropped=3)
+    assert genv._framePending
+    # the newest frame is rendered by the polling once the display can take it
+    monkeypatch.setattr(genv._display, "monitorFramePeriod", 0.0)
+    genv.get_input_key()
+    assert not genv._framePending
+    stats = genv.getCameraFrameStats()
+    assert stats["received"] == stats["rendered"] + stats["dropped"]
+    genv.exit_image_display()
+
+
+def test_get_input_key(genv, monkeypatch):
+    """Test the key presses returned to the tracker and the mouse simulation probe."""
+    from pyglet.window import key
+
+    def pump_delay(delay):
+        raise AssertionError("The polling must not block.")
+
+    monkeypatch.setattr(pylink, "pumpDelay", pump_delay)
+    tracker = genv._tracker
+    monkeypatch.setattr(tracker, "getCurrentMode", lambda: pylink.IN_SETUP_MODE)
+    monkeypatch.setattr(tracker, "readRequest", lambda variable: None)
+    genv._on_key_press(key.A, key.MOD_SHIFT)
+    genv._on_key_press(key.RETURN, 0)
+    keys = genv.get_input_key()
+    assert [(elt.__key__, elt.__mod__) for elt in keys] == [
+        (ord("a"), 1),
+        (pylink.ENTER_KEY, 0),
+    ]
+    # the probe of the mouse simulation is answered on a later poll
+    assert genv._mouseSimRequest is not None
+    assert genv.get_input_key() == []
+    assert genv._mouseSimRequest is not None
+    monkeypatch.setattr(tracker, "readReply", lambda: "1")
+    genv.get_input_key()
+    assert genv._mouseSimRequest is None
+    assert genv._msgMouseSim.autoDraw
+    genv._reset_cal_display()
+
+
+def test_release_keyboard(genv):
+    """Test that the key press handler is removed from the window."""
+    from pyglet.window import key
+
+    genv.get_input_key()
+    assert genv._keyHandlersInstalled
+    genv._on_key_press(key.A, 0)
+    genv.releaseKeyboard()
+    assert not genv._keyHandlersInstalled
+    assert genv.get_input_key() == []
+    # the handler is installed again by the next poll
+    assert genv._keyHandlersInstalled
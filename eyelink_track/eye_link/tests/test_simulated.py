@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import sys
+import time
+from threading import current_thread
+
+import numpy as np
+import pylink
+import pytest
+
+from .._simulated import (
+    SimulatedEyeLink,
+    _EyeData,
+    _Sample,
+    camera_frames,
+    camera_palette,
+)
+from .._stream import SAMPLE_DTYPE, LinkEvent, _sample_record
+from ..EyeLink import Eyelink
+
+
+@pytest.fixture
+def eye_link(tmp_path):
+    """Create a session on the simulated tracker, without graphics."""
+    eye_link = Eyelink(
+        tmp_path, "TEST", resolution=(1920, 1080), tracker=SimulatedEyeLink(seed=101)
+    )
+    yield eye_link
+    eye_link.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll a condition until it is true, instead of relying on a fixed delay."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "The condition was not met in time."
+        time.sleep(0.01)
+
+
+def test_simulated_link():
+    """Test the samples and events sent over the simulated link."""
+    tracker = SimulatedEyeLink(sampling_rate=2000, eye="left", seed=101)
+    assert tracker.getNextData() == 0
+    start = time.perf_counter()
+    tracker.startRecording(1, 1, 1, 1)
+    time.sleep(0.5)
+    types = []
+    while (data_type := tracker.getNextData()) != 0:
+        types.append(data_type)
+        data = tracker.getFloatData()
+        if data_type == 200:
+            assert data.isLeftSample()
+            assert not data.isRightSample()
+    tracker.stopRecording()
+    elapsed = time.perf_counter() - start
+    n_samples = types.count(200)
+    # the samples are generated up to the time of the drain
+    assert 0.45 * 2000 < n_samples <= elapsed * 2000 + 1
+    # at least one fixation ended within 500 ms
+    assert 8 in types
+    assert tracker.getNextData() == 0
+
+
+def test_simulated_data_file(tmp_path):
+    """Test the data file written by the simulated tracker."""
+    tracker = SimulatedEyeLink(seed=101)
+    tracker.openDataFile("TEST.EDF")
+    tracker.startRecording(1, 1, 1, 1)
+    tracker.sendMessage("START")
+    tracker.sendMessage("12 TRIGGER")
+    time.sleep(0.05)
+    tracker.stopRecording()
+    tracker.closeDataFile()
+    received = []
+    tracker.progressUpdate = lambda src, size, n: received.append((size, n))
+    size = tracker.receiveDataFile("TEST.EDF", str(tmp_path / "TEST.EDF"))
+    content = (tmp_path / "TEST.EDF").read_text()
+    assert size == len(content)
+    assert received[-1] == (size, size)
+    assert "START" in content
+    assert "TRIGGER" in content
+    assert "12 TRIGGER" not in content
+    with pytest.raises(RuntimeError, match="does not exist"):
+        tracker.receiveDataFile("OTHER.EDF", str(tmp_path / "OTHER.EDF"))
+
+
+def test_sample_record_missing_data():
+    """Test that the missing values of a sample are stored as NaN."""
+    fixation = _EyeData((960.0, 540.0), 1000.0)
+    blink = _EyeData((pylink.MISSING_DATA, pylink.MISSING_DATA), 0.0)
+    record = np.array([_sample_record(_Sample(1.0, fixation, blink))], SAMPLE_DTYPE)
+    assert record["left_gaze_x"] == 960.0
+    assert record["left_pupil"] == 1000.0
+    assert np.isnan(record["right_gaze_x"])
+    assert np.isnan(record["right_gaze_y"])
+    assert record["right_pupil"] == 0.0
+    # the simulated tracker does not track a target sticker
+    assert np.isnan(record["target_x"])
+    assert np.isnan(record["target_distance"])
+
+
+def test_camera_frames():
+    """Test the simulated camera frames."""
+    r, g, b = camera_palette()
+    frames = camera_frames(192, 160, 3, np.random.default_rng(101))
+    assert frames.shape == (3, 160, 192)
+    assert frames.dtype == np.uint8
+    assert frames.max() < len(r) == len(g) == len(b)
+
+
+def test_eyelink_simulated(eye_link, tmp_path):
+    """Test a recording with the simulated tracker, without graphics."""
+    assert eye_link._win is None
+    assert eye_link._genv is None
+    events = []
+    eye_link.add_event_callback(events.append)
+    start = time.perf_counter()
+    eye_link.start(stream=True, clock_sync=True)
+    eye_link.signal("TRIGGER", queued=True)
+    _wait_for(lambda: 300 <= len(eye_link.samples))
+    # at most the samples of the 1000 Hz recording so far
+    assert len(eye_link.samples) <= (time.perf_counter() - start) * 1000 + 1
+    data = eye_link.samples.last(100)
+    assert data.size == 100
+    assert np.all(np.diff(data["time"]) > 0)
+    report = eye_link.stop()
+    pulled = eye_link.get_events()
+    assert 0 < len(pulled)
+    assert all(isinstance(event, LinkEvent) for event in pulled)
+    assert pulled == events
+    assert eye_link.get_events() == []
+    assert report.fname == tmp_path / "TEST.EDF"
+    assert "TRIGGER" in report.fname.read_text()
+    assert eye_link.signal_stats()["latency"]["n"] == 1
+    assert (tmp_path / "TEST_clock.json").exists()
+    assert abs(eye_link.clock.drift) < 1000
+
+
+@pytest.mark.parametrize("wait", [True, False])
+def test_eyelink_stop_closes_window_on_caller_thread(eye_link, wait):
+    """Test that the window is closed on the calling thread, not the download one."""
+    threads = []
+    eye_link._close_graphics = lambda: threads.append(current_thread())
+    eye_link.start()
+    report = eye_link.stop(wait=wait)
+    if not wait:
+        report = report.result()
+    assert report.fname.exists()
+    assert threads == [current_thread()]
+    assert not eye_link.el_tracker.isConnected()
+
+
+def test_eyelink_open_file(eye_link, tmp_path):
+    """Test recording several EDF files on the same connection."""
+    tracker = eye_link.el_tracker
+    close_data_file = tracker.closeDataFile
+
+    def failing_close_data_file():
+        tracker.closeDataFile = close_data_file
+        raise RuntimeError("Simulated failure.")
+
+    # a failed download does not prevent the next recording
+    tracker.closeDataFile = failing_close_data_file
+    eye_link.start()
+    future = eye_link.stop(wait=False, close=False)
+    eye_link.open_file("B")
+    with pytest.raises(RuntimeError, match="Simulated failure"):
+        future.result()
+    eye_link.start()
+    eye_link.stop(close=False)
+    eye_link.open_file("C")
+    eye_link.start()
+    report = eye_link.stop()
+    assert report.fname == tmp_path / "C.EDF"
+    assert sorted(f.name for f in tmp_path.glob("*.EDF")) == ["B.EDF", "C.EDF"]
+    assert not tracker.isConnected()
+
+
+def test_eyelink_close_during_transfer(eye_link, tmp_path):
+    """Test that close() does not interrupt the download of the EDF file."""
+    tracker = eye_link.el_tracker
+    receive_data_file = tracker.receiveDataFile
+
+    def slow_receive_data_file(src, dest):
+        time.sleep(0.3)
+        assert tracker.isConnected()
+        return receive_data_file(src, dest)
+
+    tracker.receiveDataFile = slow_receive_data_file
+    eye_link.start()
+    future = eye_link.stop(wait=False, close=False)
+    eye_link.close()
+    assert future.done()
+    assert future.result().fname == tmp_path / "TEST.EDF"
+    assert [f.name for f in tmp_path.iterdir()] == ["TEST.EDF"]
+    assert not tracker.isConnected()
+
+
+def test_eyelink_blocks(eye_link, tmp_path):
+    """Test the rotation of the EDF file in blocks while streaming."""
+    tracker = eye_link.el_tracker
+    receive_data_file = tracker.receiveDataFile
+    modes = []
+
+    def logged_receive_data_file(src, dest):
+        modes.append(tracker.getCurrentMode())
+        return receive_data_file(src, dest)
+
+    tracker.receiveDataFile = logged_receive_data_file
+    eye_link.start(stream=True, block_duration=0.2)
+    eye_link.signal("TRIGGER", queued=True)
+    _wait_for(lambda: eye_link.edf_fname != "TEST")
+    assert eye_link.blocks == []
+    report = eye_link.stop()
+    # the files are not requested from the Host PC while recording
+    assert pylink.IN_RECORD_MODE not in modes
+    blocks = [future.result() for future in eye_link.blocks]
+    assert 1 <= len(blocks)
+    assert blocks[0].fname == tmp_path / "TEST.EDF"
+    assert blocks[0].fname.exists()
+    assert report.fname == tmp_path / f"TEST{len(blocks):03d}.EDF"
+    assert report.fname.exists()
+    assert 0 < len(eye_link.samples)
+
+
+def test_eyelink_blocks_slow_transfer(eye_link, tmp_path):
+    """Test that stop() ends the rotation cleanly when the transfers are slow."""
+    tracker = eye_link.el_tracker
+    receive_data_file = tracker.receiveDataFile
+
+    def slow_receive_data_file(src, dest):
+        time.sleep(0.2)
+        return receive_data_file(src, dest)
+
+    tracker.receiveDataFile = slow_receive_data_file
+    eye_link.start(block_duration=0.3)
+    _wait_for(lambda: eye_link.edf_fname == "TEST002")
+    report = eye_link.stop(close=False)
+    assert tracker.getCurrentMode() != pylink.IN_RECORD_MODE
+    blocks = [future.result() for future in eye_link.blocks]
+    assert 1 <= len(blocks)
+    assert eye_link.edf_fname == f"TEST{len(blocks):03d}"
+    assert report.fname == tmp_path / f"TEST{len(blocks):03d}.EDF"
+    fnames = ["TEST.EDF"] + [f"TEST{k:03d}.EDF" for k in range(1, len(blocks) + 1)]
+    assert [block.fname for block in blocks] == [tmp_path / f for f in fnames[:-1]]
+    assert sorted(f.name for f in tmp_path.glob("*.EDF")) == fnames
+    eye_link.close()
+
+
+def test_eyelink_blocks_failure(eye_link, tmp_path):
+    """Test that a failed rotation of the EDF file raises in stop()."""
+    tracker = eye_link.el_tracker
+    eye_link.start(block_duration=0.1)
+
+    def open_data_file(fname):
+        raise RuntimeError("Simulated failure.")
+
+    tracker.openDataFile = open_data_file
+    _wait_for(lambda: eye_link._rotation.error is not None)
+    with pytest.raises(RuntimeError, match="rotation of the EDF file"):
+        eye_link.stop()
+    assert (tmp_path / "TEST.EDF").exists()
+
+
+def test_eyelink_resolution(tmp_path, monkeypatch):
+    """Test the screen pixel coordinates sent to the tracker."""
+    tracker = SimulatedEyeLink(seed=101)
+    Eyelink(tmp_path, "TEST", resolution=(1280, 1024), tracker=tracker)
+    assert "screen_pixel_coords = 0 0 1279 1023" in tracker.commands
+    # without pyglet, the size of the screen can not be read
+    monkeypatch.setitem(sys.modules, "pyglet.canvas", None)
+    with pytest.raises(RuntimeError, match="Provide the 'resolution'"):
+        Eyelink(tmp_path, "TEST", tracker=SimulatedEyeLink(seed=101))
+
+
+def test_eyelink_signal_failure(eye_link, tmp_path):
+    """Test that a failed queued signal does not drop the next ones."""
+    tracker = eye_link.el_tracker
+    send_message = tracker.sendMessage
+
+    def failing_send_message(text):
+        if text.endswith("FAIL"):
+            raise RuntimeError("Simulated failure.")
+        send_message(text)
+
+    tracker.sendMessage = failing_send_message
+    for value in ("FAIL", "TRIGGER1", "TRIGGER2"):
+        eye_link.signal(value, queued=True)
+    sender = eye_link._sender
+    eye_link.close()  # sends the queued signals before closing
+    assert not sender.is_alive()
+    stats = eye_link.signal_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["failed"] == 1
+    assert stats["latency"]["n"] == 2
@@ -1,3 +1,12 @@
 """Utilities module."""
 
-from . import config, logs, qt
+from typing import TYPE_CHECKING
+
+from . import logs
+from ._imports import lazy_attributes
+
+# config loads psutil and packaging, qt loads qtpy
+__getattr__, __dir__, _ = lazy_attributes(__name__, submodules=("config", "qt"))
+
+if TYPE_CHECKING:
+    from . import config, qt
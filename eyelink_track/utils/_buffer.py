@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from threading import Event
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ._checks import check_type, ensure_int
+from .logs import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from numpy.typing import DTypeLike, NDArray
+
+
+class RingBuffer:
+    """Fixed-size ring buffer of records, written by a single producer.
+
+    The records are written twice, at ``idx`` and at ``idx + capacity``, in an
+    array of ``2 * capacity`` records. Any window of at most ``capacity``
+    consecutive records is thus contiguous in memory and returned as a view,
+    without copy and without allocation.
+
+    Parameters
+    ----------
+    dtype : dtype
+        Data type of a record, usually a structured data type.
+    capacity : int
+        Number of records kept in the buffer. Once full, the oldest records are
+        overwritten.
+
+    Notes
+    -----
+    The views returned by :meth:`last` and :meth:`iter_chunks` are overwritten
+    once ``capacity`` new records are written. Copy them to keep them longer.
+    """
+
+    def __init__(self, dtype: DTypeLike, capacity: int) -> None:
+        capacity = ensure_int(capacity, "capacity")
+        if capacity <= 0:
+            raise ValueError(
+                f"The capacity must be a strictly positive integer. Got {capacity}."
+            )
+        self._capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._count = 0
+        self._new_data = Event()
+
+    def append(self, record: tuple) -> None:
+        """Append a record to the buffer.
+
+        Parameters
+        ----------
+        record : tuple
+            Record with one element per field of the data type.
+        """
+        idx = self._count % self._capacity
+        self._data[idx] = record
+        self._data[idx + self._capacity] = record
+        # published once both copies are written
+        self._count += 1
+        self._new_data.set()
+
+    def last(self, n: int | None = None) -> NDArray:
+        """View of the last records, oldest to newest.
+
+        Parameters
+        ----------
+        n : int | None
+            Number of records. If None, all the records kept in the buffer. Can not
+            exceed the capacity.
+
+        Returns
+        -------
+        data : array of shape (n_records,)
+            View of the records.
+        """
+        count = self._count
+        n = min(count, self._capacity) if n is None else ensure_int(n, "n")
+        if not 0 <= n <= self._capacity:
+            raise ValueError(
+                f"The number of records must be between 0 and the capacity "
+                f"{self._capacity}. Got {n}."
+            )
+        n = min(n, count)
+        end = count % self._capacity + self._capacity
+        return self._data[end - n : end]
+
+    def iter_chunks(
+        self, timeout: float | None = None, stop: Event | None = None
+    ) -> Generator[NDArray, None, None]:
+        """Iterate over the records appended from now on.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time in seconds to wait for new records. If None, waits
+            indefinitely.
+        stop : Event | None
+            Event ending the generator once set.
+
+        Returns
+        -------
+        chunks : generator
+            Generator of views of shape ``(n_records,)`` on the records appended
+            since the previous chunk, oldest to newest.
+        """
+        if timeout is not None:
+            check_type(timeout, ("numeric",), "timeout")
+        check_type(stop, (Event, None), "stop")
+        return self._iter_chunks(self._count, timeout, stop)
+
+    def _iter_chunks(
+        self, read: int, timeout: float | None, stop: Event | None
+    ) -> Generator[NDArray, None, None]:
+        """Yield views of the records appended since the previous chunk."""
+        while stop is None or not stop.is_set():
+            self._new_data.clear()
+            if self._count == read:
+                self._new_data.wait(timeout)
+                if self._count == read and timeout is not None:
+                    return
+            count = self._count
+            if self._capacity < count - read:
+                logger.warning(
+                    "%i records were overwritten before being read.",
+                    count - read - self._capacity,
+                )
+                read = count - self._capacity
+            if count == read:
+                continue
+            end = count % self._capacity + self._capacity
+            yield self._data[end - (count - read) : end]
+            read = count
+
+    def __len__(self) -> int:
+        """Return the number of records kept in the buffer."""
+        return min(self._count, self._capacity)
+
+    @property
+    def capacity(self) -> int:
+        """Number of records kept in the buffer."""
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """Total number of records appended to the buffer."""
+        return self._count
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Data type of a record."""
+        return self._data.dtype
@@ -5,11 +5,10 @@ from __future__ import annotations
 import logging
 import operator
 import os
+import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import numpy as np
-
 from ._docs import fill_doc
 
 if TYPE_CHECKING:
@@ -63,12 +62,24 @@ class _Callable:
         return callable(other)
 
 
+class _NumpyType:
+    """Check against a NumPy type without importing NumPy."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __instancecheck__(self, other: Any) -> bool:
+        # an object can not be a NumPy instance if NumPy was not imported
+        np = sys.modules.get("numpy")
+        return np is not None and isinstance(other, getattr(np, self._name))
+
+
 _types = {
-    "numeric": (np.floating, float, _IntLike()),
+    "numeric": (_NumpyType("floating"), float, _IntLike()),
     "path-like": (str, Path, os.PathLike),
     "int-like": (_IntLike(),),
     "callable": (_Callable(),),
-    "array-like": (list, tuple, set, np.ndarray),
+    "array-like": (list, tuple, set, _NumpyType("ndarray")),
 }
 
 
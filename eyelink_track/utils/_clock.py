@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ._checks import check_type, ensure_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from numpy.typing import ArrayLike, NDArray
+
+
+class ClockModel:
+    """Offset and drift model between the local clock and the tracker clock.
+
+    The model is ``tracker = offset + slope * local`` with the local time in seconds
+    and the tracker time in milliseconds. The slope is 1000 for clocks without
+    drift.
+
+    Parameters
+    ----------
+    offset : float
+        Tracker time in milliseconds at the local time 0.
+    slope : float
+        Tracker milliseconds elapsed per local second.
+    """
+
+    def __init__(self, offset: float, slope: float) -> None:
+        check_type(offset, ("numeric",), "offset")
+        check_type(slope, ("numeric",), "slope")
+        if slope <= 0:
+            raise ValueError(f"The slope must be strictly positive. Got {slope}.")
+        self._offset = float(offset)
+        self._slope = float(slope)
+
+    @classmethod
+    def fit(cls, local: ArrayLike, tracker: ArrayLike) -> ClockModel:
+        """Fit the model on pairs of timestamps with the Theil-Sen estimator.
+
+        The slope is the median of the slopes between all pairs of timestamps and
+        the offset the median of the residual offsets, which makes the fit robust
+        to the timestamps delayed by the link. Above 256 timestamps, only the pairs
+        half the recording apart are used to bound the memory.
+
+        Parameters
+        ----------
+        local : array of shape (n_timestamps,)
+            Local timestamps in seconds.
+        tracker : array of shape (n_timestamps,)
+            Corresponding tracker timestamps in milliseconds.
+
+        Returns
+        -------
+        model : ClockModel
+            The fitted model.
+        """
+        local = np.asarray(local, dtype=np.float64)
+        tracker = np.asarray(tracker, dtype=np.float64)
+        if local.ndim != 1 or local.shape != tracker.shape:
+            raise ValueError(
+                "The local and tracker timestamps must be 1D arrays of the same "
+                f"shape. Got {local.shape} and {tracker.shape}."
+            )
+        if local.size < 2:
+            raise ValueError(
+                f"At least 2 pairs of timestamps are required. Got {local.size}."
+            )
+        if local.size <= 256:
+            idx, idy = np.triu_indices(local.size, k=1)
+        else:
+            idx = np.arange(local.size - local.size // 2)
+            idy = idx + local.size // 2
+        dx = local[idy] - local[idx]
+        valid = dx != 0
+        if not valid.any():
+            raise ValueError("The local timestamps must not all be identical.")
+        slope = np.median((tracker[idy] - tracker[idx])[valid] / dx[valid])
+        offset = np.median(tracker - slope * local)
+        return cls(offset, slope)
+
+    def local_to_tracker(self, times: ArrayLike) -> NDArray[np.float64]:
+        """Convert local timestamps to tracker timestamps.
+
+        Parameters
+        ----------
+        times : array-like
+            Local timestamps in seconds.
+
+        Returns
+        -------
+        times : array
+            Tracker timestamps in milliseconds.
+        """
+        return self._offset + self._slope * np.asarray(times, dtype=np.float64)
+
+    def tracker_to_local(self, times: ArrayLike) -> NDArray[np.float64]:
+        """Convert tracker timestamps to local timestamps.
+
+        Parameters
+        ----------
+        times : array-like
+            Tracker timestamps in milliseconds.
+
+        Returns
+        -------
+        times : array
+            Local timestamps in seconds.
+        """
+        return (np.asarray(times, dtype=np.float64) - self._offset) / self._slope
+
+    def save(self, fname: str | Path, **kwargs) -> None:
+        """Save the model to a JSON file.
+
+        Parameters
+        ----------
+        fname : path-like
+            Path to the JSON file.
+        **kwargs
+            Additional JSON-serializable entries saved along the model.
+        """
+        fname = ensure_path(fname, must_exist=False)
+        with open(fname, "w") as fid:
+            json.dump(dict(offset=self._offset, slope=self._slope, **kwargs), fid)
+
+    @classmethod
+    def load(cls, fname: str | Path) -> ClockModel:
+        """Load a model saved with :meth:`save`.
+
+        Parameters
+        ----------
+        fname : path-like
+            Path to the JSON file.
+
+        Returns
+        -------
+        model : ClockModel
+            The loaded model.
+        """
+        fname = ensure_path(fname, must_exist=True)
+        with open(fname) as fid:
+            content = json.load(fid)
+        return cls(content["offset"], content["slope"])
+
+    def __repr__(self) -> str:
+        """Representation of the model."""
+        return (
+            f"<ClockModel | offset {self._offset:.3f} ms, drift {self.drift:.1f} ppm>"
+        )
+
+    @property
+    def offset(self) -> float:
+        """Tracker time in milliseconds at the local time 0."""
+        return self._offset
+
+    @property
+    def slope(self) -> float:
+        """Tracker milliseconds elapsed per local second."""
+        return self._slope
+
+    @property
+    def drift(self) -> float:
+        """Drift of the tracker clock relative to the local clock, in ppm."""
+        return (self._slope / 1000 - 1) * 1e6
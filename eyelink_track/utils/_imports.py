@@ -5,11 +5,13 @@ Inspired from pandas: https://pandas.pydata.org/
 
 from __future__ import annotations
 
+import sys
 from importlib import import_module
 from importlib.util import find_spec
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from types import ModuleType
 
 # A mapping from import name to package name (on PyPI) when the package name
@@ -63,3 +65,50 @@ def import_optional_dependency(
         else:
             return None
     return import_module(name)
+
+
+def lazy_attributes(
+    package: str,
+    submodules: tuple[str, ...] = (),
+    attributes: dict[str, str] | None = None,
+) -> tuple[Callable[[str], object], Callable[[], list[str]], list[str]]:
+    """Create the module-level ``__getattr__`` loading attributes on first access.
+
+    Parameters
+    ----------
+    package : str
+        Name of the package, i.e. ``__name__`` in its ``__init__.py``.
+    submodules : tuple of str
+        Name of the submodules imported on first access.
+    attributes : dict | None
+        Mapping from the attribute name to the module defining it, relative to the
+        package, e.g. ``{"Eyelink": ".EyeLink"}``.
+
+    Returns
+    -------
+    __getattr__ : callable
+        The module-level ``__getattr__``.
+    __dir__ : callable
+        The module-level ``__dir__``, listing the attributes of the package and
+        the lazy submodules and attributes.
+    __all__ : list of str
+        The name of the lazy submodules and attributes.
+    """
+    attributes = dict() if attributes is None else attributes
+    names = sorted(set(submodules) | set(attributes))
+
+    def __getattr__(name: str) -> object:
+        if name in submodules:
+            return import_module(f".{name}", package)
+        if name in attributes:
+            value = getattr(import_module(attributes[name], package), name)
+            # cached on the package, the next accesses do not call __getattr__
+            setattr(import_module(package), name, value)
+            return value
+        raise AttributeError(f"module '{package}' has no attribute '{name}'")
+
+    def __dir__() -> list[str]:
+        # the attributes already set on the package and the lazy ones
+        return sorted(set(vars(sys.modules[package])) | set(names))
+
+    return __getattr__, __dir__, list(names)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ._checks import check_type, ensure_int
+from .logs import logger
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+class StageTimer:
+    """Record durations of named stages into fixed-size ring buffers.
+
+    Parameters
+    ----------
+    stages : tuple of str
+        Name of the timed stages.
+    capacity : int
+        Number of durations kept per stage. Once full, the oldest durations are
+        overwritten.
+    """
+
+    def __init__(self, stages: tuple[str, ...], capacity: int = 1024) -> None:
+        check_type(stages, (tuple,), "stages")
+        for stage in stages:
+            check_type(stage, (str,), "stage")
+        capacity = ensure_int(capacity, "capacity")
+        if capacity <= 0:
+            raise ValueError(
+                f"The capacity must be a strictly positive integer. Got {capacity}."
+            )
+        self._stages = {stage: k for k, stage in enumerate(stages)}
+        self._capacity = capacity
+        self._buffer = np.zeros((len(stages), capacity), dtype=np.float64)
+        self._counts = [0] * len(stages)
+
+    def record(self, stage: str, duration: float) -> None:
+        """Record the duration of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        duration : float
+            Duration in seconds.
+        """
+        k = self._stages[stage]
+        self._buffer[k, self._counts[k] % self._capacity] = duration
+        self._counts[k] += 1
+
+    def record_since(self, stage: str, start: float) -> None:
+        """Record the duration of a stage started at ``start``.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        start : float
+            Start time of the stage, as returned by :func:`time.perf_counter`.
+        """
+        self.record(stage, perf_counter() - start)
+
+    def durations(self, stage: str) -> NDArray[np.float64]:
+        """Durations recorded for a stage, in seconds, oldest to newest.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+
+        Returns
+        -------
+        durations : array of shape (n_durations,)
+            The durations kept in the ring buffer.
+        """
+        k = self._stages[stage]
+        count = self._counts[k]
+        if count <= self._capacity:
+            return self._buffer[k, :count].copy()
+        idx = count % self._capacity
+        return np.concatenate((self._buffer[k, idx:], self._buffer[k, :idx]))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summarize the recorded durations of each stage.
+
+        Returns
+        -------
+        summary : dict
+            Dictionary mapping each stage with at least one recorded duration to
+            its number of recorded durations ``n`` and to the percentiles ``p50``,
+            ``p95``, ``p99`` and the maximum ``max`` of the durations kept in the
+            ring buffer, in milliseconds.
+        """
+        summary = dict()
+        for stage, k in self._stages.items():
+            if self._counts[k] == 0:
+                continue
+            durations = self._buffer[k, : min(self._counts[k], self._capacity)] * 1e3
+            p50, p95, p99 = np.percentile(durations, (50, 95, 99))
+            summary[stage] = dict(
+                n=self._counts[k],
+                p50=float(p50),
+                p95=float(p95),
+                p99=float(p99),
+                max=float(durations.max()),
+            )
+        return summary
+
+    def log_summary(self, title: str = "Timing") -> None:
+        """Log the summary of the recorded durations at the INFO level.
+
+        Parameters
+        ----------
+        title : str
+            Title prepended to each logged line.
+        """
+        for stage, stats in self.summary().items():
+            logger.info(
+                "%s '%s' (n=%i): p50 %.2f ms, p95 %.2f ms, p99 %.2f ms, max %.2f ms",
+                title,
+                stage,
+                stats["n"],
+                stats["p50"],
+                stats["p95"],
+                stats["p99"],
+                stats["max"],
+            )
+
+    def reset(self) -> None:
+        """Discard the recorded durations."""
+        self._counts = [0] * len(self._stages)
+
+    @property
+    def stages(self) -> tuple[str, ...]:
+        """Name of the timed stages."""
+        return tuple(self._stages)
+
+    @property
+    def capacity(self) -> int:
+        """Number of durations kept per stage."""
+        return self._capacity
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+from ._checks import check_type, ensure_int, ensure_path
+from .logs import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+@dataclass(frozen=True)
+class TransferReport:
+    """Report of a verified file download.
+
+    Attributes
+    ----------
+    fname : Path
+        Path to the downloaded file.
+    size : int
+        Size of the downloaded file in bytes.
+    duration : float
+        Duration of the successful attempt in seconds.
+    attempts : int
+        Number of attempts, including the successful one.
+    """
+
+    fname: Path
+    size: int
+    duration: float
+    attempts: int
+
+    @property
+    def throughput(self) -> float:
+        """Throughput of the successful attempt in bytes per second."""
+        return self.size / self.duration if 0 < self.duration else float("inf")
+
+
+def download_file(
+    receive: Callable[[str, str], int],
+    src: str,
+    fname: str | Path,
+    retries: int = 3,
+    backoff: float = 1.0,
+) -> TransferReport:
+    """Download a file to a temporary file, verify it and rename it.
+
+    Parameters
+    ----------
+    receive : callable
+        Function called with the source file name and the local destination path.
+        It should return the size of the source file in bytes as reported by the
+        remote host, e.g. :meth:`pylink.EyeLink.receiveDataFile`.
+    src : str
+        Name of the file on the remote host.
+    fname : path-like
+        Local path of the downloaded file. If it already exists, the file is
+        renamed with a numbered suffix instead of being overwritten.
+    retries : int
+        Number of additional attempts after a failed attempt.
+    backoff : float
+        Delay in seconds before the first retry, doubled after each retry.
+
+    Returns
+    -------
+    report : TransferReport
+        The report of the download.
+    """
+    check_type(receive, ("callable",), "receive")
+    check_type(src, (str,), "src")
+    fname = ensure_path(fname, must_exist=False)
+    retries = ensure_int(retries, "retries")
+    if retries < 0:
+        raise ValueError(f"The number of retries must be positive. Got {retries}.")
+    check_type(backoff, ("numeric",), "backoff")
+    # keep the extension, some receivers enforce it
+    tmp = fname.with_name(f"{fname.stem}.part{fname.suffix}")
+    for attempt in range(1, retries + 2):
+        # the receiver might write to an unused name if the destination exists
+        tmp.unlink(missing_ok=True)
+        start = perf_counter()
+        try:
+            size = receive(src, str(tmp))
+            duration = perf_counter() - start
+            if size <= 0:
+                raise RuntimeError(f"The host reported a size of {size} bytes.")
+            local_size = tmp.stat().st_size if tmp.exists() else 0
+            if local_size != size:
+                raise RuntimeError(
+                    f"The downloaded file is incomplete: {local_size} / {size} bytes."
+                )
+        except (RuntimeError, OSError) as error:
+            if retries + 1 <= attempt:
+                tmp.unlink(missing_ok=True)
+                raise RuntimeError(
+                    f"The download of '{src}' failed after {attempt} attempts."
+                ) from error
+            delay = backoff * 2 ** (attempt - 1)
+            logger.warning(
+                "The download of '%s' failed (attempt %i/%i): %s. Retrying in %.1f s.",
+                src,
+                attempt,
+                retries + 1,
+                error,
+                delay,
+            )
+            sleep(delay)
+            continue
+        break
+    fname = _unused_fname(fname)
+    os.replace(tmp, fname)
+    report = TransferReport(fname, size, duration, attempt)
+    logger.info(
+        "Downloaded '%s' to '%s': %.1f MB in %.1f s (%.1f MB/s, %i attempt(s)).",
+        src,
+        fname,
+        size / 1e6,
+        duration,
+        report.throughput / 1e6,
+        attempt,
+    )
+    return report
+
+
+def _unused_fname(fname: Path) -> Path:
+    """Add a numbered suffix to a file name until it does not exist."""
+    if not fname.exists():
+        return fname
+    k = 1
+    while (candidate := fname.with_stem(f"{fname.stem}_{k}")).exists():
+        k += 1
+    logger.warning("'%s' already exists, the file is saved as '%s'.", fname, candidate)
+    return candidate
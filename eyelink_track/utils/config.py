@@ -3,18 +3,16 @@ from __future__ import annotations
 import platform
 import sys
 from functools import lru_cache, partial
-from importlib.metadata import metadata, requires, version
 from typing import TYPE_CHECKING
 
-import psutil
-from packaging.requirements import Requirement
-
 from ._checks import check_type
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from typing import IO
 
+    from packaging.requirements import Requirement
+
 
 def sys_info(fid: IO | None = None, developer: bool = False):
     """Print the system information for debugging.
@@ -27,6 +25,11 @@ def sys_info(fid: IO | None = None, developer: bool = False):
     developer : bool
         If True, display information about optional dependencies.
     """
+    from importlib.metadata import metadata, requires, version
+
+    import psutil
+    from packaging.requirements import Requirement
+
     check_type(developer, (bool,), "developer")
 
     ljust = 26
@@ -81,6 +84,8 @@ def _list_dependencies_info(
     out: Callable, ljust: int, package: str, dependencies: list[Requirement]
 ) -> None:
     """List dependencies names and versions."""
+    from importlib.metadata import version
+
     unicode = sys.stdout.encoding.lower().startswith("utf")
     if unicode:
         ljust += 1
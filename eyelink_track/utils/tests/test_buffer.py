@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from threading import Event, Thread
+
+import numpy as np
+import pytest
+
+from .._buffer import RingBuffer
+
+_DTYPE = np.dtype([("time", np.float64), ("x", np.float32)])
+
+
+def test_ring_buffer():
+    """Test appending and viewing records."""
+    buffer = RingBuffer(_DTYPE, 4)
+    assert buffer.capacity == 4
+    assert buffer.dtype == _DTYPE
+    assert len(buffer) == 0
+    assert buffer.last().size == 0
+    for k in range(3):
+        buffer.append((k, 2 * k))
+    assert len(buffer) == 3
+    assert buffer.count == 3
+    assert np.array_equal(buffer.last()["time"], (0, 1, 2))
+    assert np.array_equal(buffer.last(2)["x"], (2, 4))
+    assert np.array_equal(buffer.last(4)["time"], (0, 1, 2))
+    # once full, the oldest records are overwritten and the views stay contiguous
+    for k in range(3, 10):
+        buffer.append((k, 2 * k))
+    assert len(buffer) == 4
+    assert buffer.count == 10
+    data = buffer.last()
+    assert np.array_equal(data["time"], (6, 7, 8, 9))
+    assert data.base is not None  # view, not a copy
+    assert np.array_equal(buffer.last(1)["time"], (9,))
+    with pytest.raises(ValueError, match="between 0 and the capacity"):
+        buffer.last(5)
+    with pytest.raises(ValueError, match="strictly positive"):
+        RingBuffer(_DTYPE, 0)
+
+
+def test_ring_buffer_iter_chunks():
+    """Test iterating over new records written by another thread."""
+    buffer = RingBuffer(_DTYPE, 1000)
+    buffer.append((-1, 0))  # appended before the generator is created
+    chunks = buffer.iter_chunks(timeout=0.5)
+    started = Event()
+
+    def produce():
+        started.wait()
+        for k in range(500):
+            buffer.append((k, k))
+
+    thread = Thread(target=produce)
+    thread.start()
+    received = []
+    started.set()
+    for chunk in chunks:
+        received.extend(chunk["time"].tolist())
+        if len(received) == 500:
+            break
+    thread.join()
+    assert received == list(range(500))
+    # the generator ends once no record is received within the timeout
+    assert list(buffer.iter_chunks(timeout=0.01)) == []
+
+
+def test_ring_buffer_iter_chunks_overrun(caplog: pytest.LogCaptureFixture):
+    """Test a consumer falling behind the producer."""
+    buffer = RingBuffer(_DTYPE, 4)
+    chunks = buffer.iter_chunks(timeout=0.01)
+    buffer.append((0, 0))
+    assert np.array_equal(next(chunks)["time"], (0,))
+    for k in range(1, 11):
+        buffer.append((k, k))
+    caplog.clear()
+    assert np.array_equal(next(chunks)["time"], (7, 8, 9, 10))
+    assert "6 records were overwritten" in caplog.text
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from .._clock import ClockModel
+
+
+@pytest.mark.parametrize("n_timestamps", [50, 1000])
+def test_clock_model_fit(n_timestamps: int):
+    """Test fitting the model on timestamps delayed by the link."""
+    rng = np.random.default_rng(101)
+    local = np.sort(rng.uniform(1000, 4600, size=n_timestamps))
+    slope = 1000 * (1 + 20e-6)  # 20 ppm drift
+    tracker = 12345.678 + slope * local
+    # jitter and a few reads strongly delayed by the link
+    tracker += rng.uniform(0, 0.05, size=local.size)
+    outliers = rng.choice(local.size, size=local.size // 10, replace=False)
+    tracker[outliers] += rng.uniform(5, 50, size=outliers.size)
+    model = ClockModel.fit(local, tracker)
+    assert model.slope == pytest.approx(slope, rel=1e-7)
+    assert model.drift == pytest.approx(20, abs=0.1)
+    times = local[:10]
+    assert np.allclose(
+        model.local_to_tracker(times), 12345.678 + slope * times, atol=0.1
+    )
+    assert np.allclose(model.tracker_to_local(model.local_to_tracker(times)), times)
+
+
+def test_clock_model_save(tmp_path):
+    """Test saving and loading the model."""
+    model = ClockModel(10.0, 1000.001)
+    model.save(tmp_path / "clock.json", local=[1.0, 2.0])
+    loaded = ClockModel.load(tmp_path / "clock.json")
+    assert loaded.offset == model.offset
+    assert loaded.slope == model.slope
+    assert "ClockModel" in repr(loaded)
+
+
+def test_clock_model_invalid():
+    """Test invalid arguments."""
+    with pytest.raises(ValueError, match="strictly positive"):
+        ClockModel(0, 0)
+    with pytest.raises(ValueError, match="same shape"):
+        ClockModel.fit([1, 2, 3], [1, 2])
+    with pytest.raises(ValueError, match="At least 2"):
+        ClockModel.fit([1], [1])
+    with pytest.raises(ValueError, match="not all be identical"):
+        ClockModel.fit([1, 1], [1, 2])
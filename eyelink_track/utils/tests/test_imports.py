@@ -1,7 +1,13 @@
+import subprocess
+import sys
+
 import pytest
 
 from .._imports import import_optional_dependency
 
+# cold import time budget of the package and of the CLI, in seconds
+_IMPORT_TIME_BUDGET: float = 0.25
+
 
 def test_import_optional_dependency():
     """Test the import of optional dependencies."""
@@ -20,3 +26,50 @@ def test_import_optional_dependency():
     # Test extra
     with pytest.raises(ImportError, match="blabla"):
         import_optional_dependency("non_existing_pkg", extra="blabla")
+
+
+def _import_time(module: str) -> tuple[float, set[str]]:
+    """Measure the cold import time of a module in a new interpreter.
+
+    Returns the cumulative import time in seconds and the name of the imported
+    modules, parsed from the output of ``python -X importtime``.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    cumulative = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        cumulative[name.strip()] = int(cumulative_us) * 1e-6
+    return cumulative[module], set(cumulative)
+
+
+@pytest.mark.parametrize("module", ["eyelink_track", "eyelink_track.commands.main"])
+def test_import_time(module: str):
+    """Test that the package and the CLI import fast, without heavy dependencies."""
+    duration, modules = _import_time(module)
+    for heavy in ("numpy", "packaging", "psutil", "psychopy", "pylink", "qtpy"):
+        assert heavy not in modules, f"'{heavy}' is imported by '{module}'."
+    assert duration < _IMPORT_TIME_BUDGET, (
+        f"Importing '{module}' took {duration:.3f} s, above the budget of "
+        f"{_IMPORT_TIME_BUDGET} s."
+    )
+
+
+def test_lazy_attributes():
+    """Test the lazy loading of the attributes of a package."""
+    import eyelink_track
+
+    assert "sys_info" in dir(eyelink_track)
+    for name in ("add_file_handler", "logger", "set_log_level", "utils"):
+        assert name in dir(eyelink_track)
+    assert {"config", "logs", "qt"} <= set(dir(eyelink_track.utils))
+    assert callable(eyelink_track.sys_info)
+    assert isinstance(eyelink_track.__version__, str)
+    with pytest.raises(AttributeError, match="has no attribute"):
+        eyelink_track.non_existing_attribute  # noqa: B018
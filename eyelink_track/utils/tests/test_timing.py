@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from .._timing import StageTimer
+from ..logs import _use_log_level
+
+
+def test_stage_timer():
+    """Test recording and summarizing stage durations."""
+    timer = StageTimer(("decode", "flip"), capacity=4)
+    assert timer.stages == ("decode", "flip")
+    assert timer.capacity == 4
+    assert timer.summary() == dict()
+    for duration in (0.001, 0.002, 0.003):
+        timer.record("decode", duration)
+    assert np.allclose(timer.durations("decode"), (0.001, 0.002, 0.003))
+    assert timer.durations("flip").size == 0
+    summary = timer.summary()
+    assert list(summary) == ["decode"]
+    assert summary["decode"]["n"] == 3
+    assert summary["decode"]["p50"] == pytest.approx(2.0)
+    assert summary["decode"]["max"] == pytest.approx(3.0)
+
+    # the ring buffer overwrites the oldest durations
+    for duration in (0.004, 0.005, 0.010):
+        timer.record("decode", duration)
+    assert np.allclose(timer.durations("decode"), (0.003, 0.004, 0.005, 0.010))
+    summary = timer.summary()
+    assert summary["decode"]["n"] == 6
+    assert summary["decode"]["max"] == pytest.approx(10.0)
+
+    timer.record_since("flip", 0.0)
+    assert timer.durations("flip").size == 1
+    timer.reset()
+    assert timer.summary() == dict()
+
+
+def test_stage_timer_log(caplog: pytest.LogCaptureFixture):
+    """Test logging of the summary."""
+    timer = StageTimer(("flip",))
+    timer.record("flip", 0.016)
+    with _use_log_level("INFO"):
+        caplog.clear()
+        timer.log_summary("Calibration")
+    assert "Calibration 'flip' (n=1)" in caplog.text
+
+
+def test_stage_timer_invalid():
+    """Test invalid arguments."""
+    with pytest.raises(TypeError, match="must be an instance of"):
+        StageTimer("flip")
+    with pytest.raises(ValueError, match="strictly positive"):
+        StageTimer(("flip",), capacity=0)
+    timer = StageTimer(("flip",))
+    with pytest.raises(KeyError):
+        timer.record("decode", 0.001)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from .._transfer import TransferReport, download_file
+
+
+class _Receiver:
+    """Write the content to the destination, truncated for the first failures."""
+
+    def __init__(self, content: bytes, n_failures: int = 0) -> None:
+        self.content = content
+        self.n_failures = n_failures
+        self.calls = 0
+
+    def __call__(self, src: str, dest: str) -> int:
+        self.calls += 1
+        with open(dest, "wb") as fid:
+            if self.calls <= self.n_failures:
+                fid.write(self.content[: len(self.content) // 2])
+            else:
+                fid.write(self.content)
+        return len(self.content)
+
+
+def test_download_file(tmp_path):
+    """Test a verified download."""
+    receiver = _Receiver(b"0123456789")
+    report = download_file(receiver, "TEST.EDF", tmp_path / "TEST.EDF", backoff=0)
+    assert isinstance(report, TransferReport)
+    assert report.fname == tmp_path / "TEST.EDF"
+    assert report.fname.read_bytes() == b"0123456789"
+    assert report.size == 10
+    assert report.attempts == 1
+    assert 0 < report.throughput
+    assert [path.name for path in tmp_path.iterdir()] == ["TEST.EDF"]
+
+    # an existing file is not overwritten
+    report = download_file(receiver, "TEST.EDF", tmp_path / "TEST.EDF", backoff=0)
+    assert report.fname == tmp_path / "TEST_1.EDF"
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "TEST.EDF",
+        "TEST_1.EDF",
+    ]
+
+
+def test_download_file_retries(tmp_path):
+    """Test that incomplete downloads are retried."""
+    receiver = _Receiver(b"0123456789", n_failures=2)
+    report = download_file(receiver, "TEST.EDF", tmp_path / "TEST.EDF", backoff=0)
+    assert receiver.calls == 3
+    assert report.attempts == 3
+    assert report.fname.read_bytes() == b"0123456789"
+
+    receiver = _Receiver(b"0123456789", n_failures=2)
+    with pytest.raises(RuntimeError, match="failed after 2 attempts"):
+        download_file(
+            receiver, "TEST.EDF", tmp_path / "OTHER.EDF", retries=1, backoff=0
+        )
+    assert not (tmp_path / "OTHER.EDF").exists()
+    assert not (tmp_path / "OTHER.part.EDF").exists()
+
+
+def test_download_file_invalid(tmp_path):
+    """Test invalid arguments."""
+    with pytest.raises(TypeError, match="must be an instance of"):
+        download_file(101, "TEST.EDF", tmp_path / "TEST.EDF")
+    with pytest.raises(ValueError, match="must be positive"):
+        download_file(_Receiver(b"0"), "TEST.EDF", tmp_path / "TEST.EDF", retries=-1)